@@ -7,25 +7,127 @@ and customizing the analysis for different aircraft categories and operational r
 - @awade12 may 20th 2025
 """
 
-from typing import Dict, Any
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, Any, Final, List, Mapping, Sequence, Tuple
+from dataclasses import dataclass, field, fields
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+import orjson
 
-class AircraftCategory(Enum):
+# Display names, indexed by enum value
+_AIRCRAFT_CATEGORY_NAMES: Final = ("light", "light_twin", "turboprop", "light_jet", "heavy")
+_RISK_PROFILE_NAMES: Final = ("conservative", "standard", "aggressive")
+
+class AircraftCategory(IntEnum):
     """Aircraft categories for performance-based risk assessment"""
-    LIGHT = "light"           # Single-engine, < 12,500 lbs
-    LIGHT_TWIN = "light_twin" # Twin-engine, < 12,500 lbs  
-    TURBOPROP = "turboprop"   # Turboprop aircraft
-    LIGHT_JET = "light_jet"   # Light jets, < 41,000 lbs
-    HEAVY = "heavy"           # > 41,000 lbs
+    LIGHT = 0       # Single-engine, < 12,500 lbs
+    LIGHT_TWIN = 1  # Twin-engine, < 12,500 lbs  
+    TURBOPROP = 2   # Turboprop aircraft
+    LIGHT_JET = 3   # Light jets, < 41,000 lbs
+    HEAVY = 4       # > 41,000 lbs
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used in API responses"""
+        return _AIRCRAFT_CATEGORY_NAMES[self]
 
-class RiskProfile(Enum):
+class RiskProfile(IntEnum):
     """Risk assessment profiles for different operational requirements"""
-    CONSERVATIVE = "conservative"     # Lower risk tolerance, stricter thresholds
-    STANDARD = "standard"            # Balanced risk assessment
-    AGGRESSIVE = "aggressive"        # Higher risk tolerance for experienced pilots
+    CONSERVATIVE = 0  # Lower risk tolerance, stricter thresholds
+    STANDARD = 1      # Balanced risk assessment
+    AGGRESSIVE = 2    # Higher risk tolerance for experienced pilots
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used in API responses"""
+        return _RISK_PROFILE_NAMES[self]
+
+# Threshold multipliers, indexed by risk profile
+_MULTIPLIERS: Final = (
+    0.7,  # CONSERVATIVE: lower thresholds = higher sensitivity (more conservative)
+    1.0,  # STANDARD: standard thresholds
+    1.4   # AGGRESSIVE: higher thresholds = lower sensitivity (less conservative)
+)
+
+# Threshold tables only depend on the multiplier (and runway requirement), so they are built
+# once and shared read-only between every config that uses the same values
+@lru_cache(maxsize=32)
+def _thermal_thresholds(mult: float) -> Mapping[str, int]:
+    return MappingProxyType({
+        "high_thermal_temp": int(25 * mult),
+        "high_thermal_spread": int(10 * mult),
+        "inversion_temp": int(5 * mult),
+        "inversion_spread": int(3 * mult)
+    })
+
+@lru_cache(maxsize=32)
+def _stability_thresholds(mult: float) -> Mapping[str, int]:
+    return MappingProxyType({
+        "convective_temp": int(20 * mult),
+        "convective_spread": int(5 * mult),
+        "mechanical_wind": int(20 * mult),
+        "mechanical_spread": int(15 * mult)
+    })
 
-@dataclass
+@lru_cache(maxsize=32)
+def _performance_thresholds(mult: float, runway_length_requirement: int) -> Mapping[str, int]:
+    base_length = int(runway_length_requirement * mult)
+    return MappingProxyType({
+        "marginal_runway": base_length - 500,
+        "concerning_runway": base_length - 200,
+        "adequate_runway": base_length + 500,
+        "high_da_threshold": int(3000 * mult),
+        "moderate_da_threshold": int(2000 * mult)
+    })
+
+@lru_cache(maxsize=32)
+def _turbulence_thresholds(mult: float) -> Mapping[str, float]:
+    return MappingProxyType({
+        "severe_gust_factor": 2.0 / mult,
+        "significant_gust_factor": 1.5 / mult,
+        "moderate_gust_factor": 1.3 / mult,
+        "strong_wind_threshold": int(25 * mult),
+        "fresh_wind_threshold": int(20 * mult)
+    })
+
+class ThresholdIdx(IntEnum):
+    """Position of each threshold in AdvancedRiskConfig.threshold_table (names match the dict keys)"""
+    HIGH_THERMAL_TEMP = 0
+    HIGH_THERMAL_SPREAD = 1
+    INVERSION_TEMP = 2
+    INVERSION_SPREAD = 3
+    CONVECTIVE_TEMP = 4
+    CONVECTIVE_SPREAD = 5
+    MECHANICAL_WIND = 6
+    MECHANICAL_SPREAD = 7
+    MARGINAL_RUNWAY = 8
+    CONCERNING_RUNWAY = 9
+    ADEQUATE_RUNWAY = 10
+    HIGH_DA_THRESHOLD = 11
+    MODERATE_DA_THRESHOLD = 12
+    SEVERE_GUST_FACTOR = 13
+    SIGNIFICANT_GUST_FACTOR = 14
+    MODERATE_GUST_FACTOR = 15
+    STRONG_WIND_THRESHOLD = 16
+    FRESH_WIND_THRESHOLD = 17
+
+def _build_threshold_table(*threshold_maps: Mapping[str, float]) -> np.ndarray:
+    merged = {}
+    for thresholds in threshold_maps:
+        merged.update(thresholds)
+    table = np.array([merged[idx.name.lower()] for idx in ThresholdIdx], dtype=np.float64)
+    table.flags.writeable = False
+    return table
+
+@lru_cache(maxsize=32)
+def _default_threshold_table(mult: float, runway_length_requirement: int) -> np.ndarray:
+    return _build_threshold_table(
+        _thermal_thresholds(mult), _stability_thresholds(mult),
+        _performance_thresholds(mult, runway_length_requirement), _turbulence_thresholds(mult)
+    )
+
+@dataclass(frozen=True, slots=True)
 class AdvancedRiskConfig:
     """Configuration class for risk analysis"""
     
@@ -45,59 +147,104 @@ class AdvancedRiskConfig:
     # Risk profile
     risk_profile: RiskProfile = RiskProfile.STANDARD
     
-    # Threshold multipliers based on risk profile
     @property
     def threshold_multiplier(self) -> float:
         """Get threshold multiplier based on risk profile"""
-        multipliers = {
-            RiskProfile.CONSERVATIVE: 0.7,  # Lower thresholds = higher sensitivity (more conservative)
-            RiskProfile.STANDARD: 1.0,      # Standard thresholds
-            RiskProfile.AGGRESSIVE: 1.4     # Higher thresholds = lower sensitivity (less conservative)
-        }
-        return multipliers[self.risk_profile]
+        return _MULTIPLIERS[self.risk_profile]
     
     # Risk thresholds (can be adjusted based on operational requirements)
-    thermal_gradient_thresholds: Dict[str, int] = None
-    stability_index_thresholds: Dict[str, int] = None
-    performance_risk_thresholds: Dict[str, int] = None
-    turbulence_risk_thresholds: Dict[str, int] = None
+    thermal_gradient_thresholds: Mapping[str, int] = field(default=None, hash=False)
+    stability_index_thresholds: Mapping[str, int] = field(default=None, hash=False)
+    performance_risk_thresholds: Mapping[str, int] = field(default=None, hash=False)
+    turbulence_risk_thresholds: Mapping[str, float] = field(default=None, hash=False)
+    
+    # All of the above packed into one read-only float64 array, indexed by ThresholdIdx (batch kernels)
+    threshold_table: np.ndarray = field(init=False, default=None, repr=False, compare=False, hash=False)
     
     def __post_init__(self):
         """Initialize default thresholds if not provided"""
+        mult = _MULTIPLIERS[self.risk_profile]
+        all_defaults = (self.thermal_gradient_thresholds is None and self.stability_index_thresholds is None
+                        and self.performance_risk_thresholds is None and self.turbulence_risk_thresholds is None)
+        
         if self.thermal_gradient_thresholds is None:
-            self.thermal_gradient_thresholds = {
-                "high_thermal_temp": int(25 * self.threshold_multiplier),
-                "high_thermal_spread": int(10 * self.threshold_multiplier),
-                "inversion_temp": int(5 * self.threshold_multiplier),
-                "inversion_spread": int(3 * self.threshold_multiplier)
-            }
+            object.__setattr__(self, "thermal_gradient_thresholds", _thermal_thresholds(mult))
         
         if self.stability_index_thresholds is None:
-            self.stability_index_thresholds = {
-                "convective_temp": int(20 * self.threshold_multiplier),
-                "convective_spread": int(5 * self.threshold_multiplier),
-                "mechanical_wind": int(20 * self.threshold_multiplier),
-                "mechanical_spread": int(15 * self.threshold_multiplier)
-            }
+            object.__setattr__(self, "stability_index_thresholds", _stability_thresholds(mult))
         
         if self.performance_risk_thresholds is None:
-            base_length = int(self.runway_length_requirement * self.threshold_multiplier)
-            self.performance_risk_thresholds = {
-                "marginal_runway": base_length - 500,
-                "concerning_runway": base_length - 200,
-                "adequate_runway": base_length + 500,
-                "high_da_threshold": int(3000 * self.threshold_multiplier),
-                "moderate_da_threshold": int(2000 * self.threshold_multiplier)
-            }
+            object.__setattr__(self, "performance_risk_thresholds",
+                               _performance_thresholds(mult, self.runway_length_requirement))
         
         if self.turbulence_risk_thresholds is None:
-            self.turbulence_risk_thresholds = {
-                "severe_gust_factor": 2.0 / self.threshold_multiplier,
-                "significant_gust_factor": 1.5 / self.threshold_multiplier,
-                "moderate_gust_factor": 1.3 / self.threshold_multiplier,
-                "strong_wind_threshold": int(25 * self.threshold_multiplier),
-                "fresh_wind_threshold": int(20 * self.threshold_multiplier)
-            }
+            object.__setattr__(self, "turbulence_risk_thresholds", _turbulence_thresholds(mult))
+        
+        if all_defaults:
+            table = _default_threshold_table(mult, self.runway_length_requirement)
+        else:
+            table = _build_threshold_table(self.thermal_gradient_thresholds, self.stability_index_thresholds,
+                                           self.performance_risk_thresholds, self.turbulence_risk_thresholds)
+        object.__setattr__(self, "threshold_table", table)
+
+# Map aircraft types to categories
+_AIRCRAFT_MAPPING: Final[Mapping[str, AircraftCategory]] = MappingProxyType({
+    "c172": AircraftCategory.LIGHT,
+    "c182": AircraftCategory.LIGHT,
+    "c210": AircraftCategory.LIGHT,
+    "pa28": AircraftCategory.LIGHT,
+    "pa34": AircraftCategory.LIGHT_TWIN,
+    "be58": AircraftCategory.LIGHT_TWIN,
+    "tbm": AircraftCategory.TURBOPROP,
+    "pc12": AircraftCategory.TURBOPROP,
+    "citation": AircraftCategory.LIGHT_JET,
+    "king_air": AircraftCategory.TURBOPROP
+})
+
+# Map experience levels to risk profiles
+_EXPERIENCE_MAPPING: Final[Mapping[str, RiskProfile]] = MappingProxyType({
+    "student": RiskProfile.CONSERVATIVE,
+    "private": RiskProfile.CONSERVATIVE,
+    "instrument": RiskProfile.STANDARD,
+    "commercial": RiskProfile.STANDARD,
+    "atp": RiskProfile.AGGRESSIVE,
+    "cfi": RiskProfile.STANDARD,
+    "standard": RiskProfile.STANDARD
+})
+
+# Runway requirements based on aircraft category
+_RUNWAY_REQUIREMENTS: Final[Mapping[AircraftCategory, int]] = MappingProxyType({
+    AircraftCategory.LIGHT: 2000,
+    AircraftCategory.LIGHT_TWIN: 2500,
+    AircraftCategory.TURBOPROP: 3000,
+    AircraftCategory.LIGHT_JET: 3500,
+    AircraftCategory.HEAVY: 5000
+})
+
+# Configs are immutable, so every request with the same derived settings can share one instance
+@lru_cache(maxsize=64)
+def _conditions_config(risk_profile: RiskProfile, enable_thermal_analysis: bool,
+                       enable_turbulence_analysis: bool) -> AdvancedRiskConfig:
+    return AdvancedRiskConfig(
+        enable_thermal_analysis=enable_thermal_analysis,
+        enable_turbulence_analysis=enable_turbulence_analysis,
+        risk_profile=risk_profile
+    )
+
+@lru_cache(maxsize=64)
+def _aircraft_config(aircraft_category: AircraftCategory, risk_profile: RiskProfile) -> AdvancedRiskConfig:
+    return AdvancedRiskConfig(
+        aircraft_category=aircraft_category,
+        risk_profile=risk_profile,
+        runway_length_requirement=_RUNWAY_REQUIREMENTS[aircraft_category]
+    )
+
+def _resolve_one(aircraft_type: str, experience_level: str,
+                 aircraft_mapping: Mapping[str, AircraftCategory],
+                 experience_mapping: Mapping[str, RiskProfile]) -> AdvancedRiskConfig:
+    aircraft_category = aircraft_mapping.get(aircraft_type.lower(), AircraftCategory.LIGHT)
+    risk_profile = experience_mapping.get(experience_level.lower(), RiskProfile.STANDARD)
+    return _aircraft_config(aircraft_category, risk_profile)
 
 class ConfigurationManager:
     """Manages configuration for different operational scenarios"""
@@ -105,69 +252,53 @@ class ConfigurationManager:
     @staticmethod
     def get_config_for_aircraft(aircraft_type: str, experience_level: str = "standard") -> AdvancedRiskConfig:
         """Get configuration optimized for specific aircraft type and pilot experience"""
-        
-        # Map aircraft types to categories
-        aircraft_mapping = {
-            "c172": AircraftCategory.LIGHT,
-            "c182": AircraftCategory.LIGHT,
-            "c210": AircraftCategory.LIGHT,
-            "pa28": AircraftCategory.LIGHT,
-            "pa34": AircraftCategory.LIGHT_TWIN,
-            "be58": AircraftCategory.LIGHT_TWIN,
-            "tbm": AircraftCategory.TURBOPROP,
-            "pc12": AircraftCategory.TURBOPROP,
-            "citation": AircraftCategory.LIGHT_JET,
-            "king_air": AircraftCategory.TURBOPROP
-        }
-        
-        # Map experience levels to risk profiles
-        experience_mapping = {
-            "student": RiskProfile.CONSERVATIVE,
-            "private": RiskProfile.CONSERVATIVE,
-            "instrument": RiskProfile.STANDARD,
-            "commercial": RiskProfile.STANDARD,
-            "atp": RiskProfile.AGGRESSIVE,
-            "cfi": RiskProfile.STANDARD,
-            "standard": RiskProfile.STANDARD
-        }
-        
-        aircraft_category = aircraft_mapping.get(aircraft_type.lower(), AircraftCategory.LIGHT)
-        risk_profile = experience_mapping.get(experience_level.lower(), RiskProfile.STANDARD)
-        
-        # Adjust runway requirements based on aircraft category
-        runway_requirements = {
-            AircraftCategory.LIGHT: 2000,
-            AircraftCategory.LIGHT_TWIN: 2500,
-            AircraftCategory.TURBOPROP: 3000,
-            AircraftCategory.LIGHT_JET: 3500,
-            AircraftCategory.HEAVY: 5000
-        }
-        
-        return AdvancedRiskConfig(
-            aircraft_category=aircraft_category,
-            risk_profile=risk_profile,
-            runway_length_requirement=runway_requirements[aircraft_category]
-        )
+        return _resolve_one(aircraft_type, experience_level, _AIRCRAFT_MAPPING, _EXPERIENCE_MAPPING)
+    
+    @staticmethod
+    def get_configs_for_aircraft_batch(pairs: Sequence[Tuple[str, str]]) -> List[AdvancedRiskConfig]:
+        """Get configurations for many (aircraft_type, experience_level) pairs; repeated pairs share one instance"""
+        aircraft_mapping = _AIRCRAFT_MAPPING
+        experience_mapping = _EXPERIENCE_MAPPING
+        return [_resolve_one(aircraft_type, experience_level, aircraft_mapping, experience_mapping)
+                for aircraft_type, experience_level in pairs]
     
     @staticmethod
     def get_config_for_conditions(conditions: Dict[str, Any]) -> AdvancedRiskConfig:
         """Get configuration optimized for specific weather conditions"""
-        config = AdvancedRiskConfig()
+        enable_thermal_analysis = True
+        enable_turbulence_analysis = True
+        risk_profile = RiskProfile.STANDARD
         
         # Disable certain analyses if conditions don't warrant them
         if conditions.get("temp_c", 15) < 0 or conditions.get("temp_c", 15) > 35:
             # Better thermal analysis for extreme temperatures
-            config.enable_thermal_analysis = True
+            enable_thermal_analysis = True
         
         if conditions.get("wind_gust", 0) > conditions.get("wind_speed", 0) * 1.3:
             # Better turbulence analysis for gusty conditions
-            config.enable_turbulence_analysis = True
+            enable_turbulence_analysis = True
         
-        if any("TS" in w for w in conditions.get("weather", [])):
+        # One substring scan over the joined tokens; the space separator can't form "TS" across tokens
+        if "TS" in " ".join(conditions.get("weather", [])):
             # Conservative profile for thunderstorm conditions
-            config.risk_profile = RiskProfile.CONSERVATIVE
+            risk_profile = RiskProfile.CONSERVATIVE
         
-        return config
+        return _conditions_config(risk_profile, enable_thermal_analysis, enable_turbulence_analysis)
+
+# Constructor fields, in declaration order; threshold_table is derived and never serialized
+_INIT_FIELDS = tuple(f.name for f in fields(AdvancedRiskConfig) if f.init)
+
+@lru_cache(maxsize=64)
+def encode_config(config: AdvancedRiskConfig) -> bytes:
+    """JSON-encode a config (for cache keys, logs or passing between workers), cached per distinct config"""
+    return orjson.dumps({name: getattr(config, name) for name in _INIT_FIELDS}, default=dict)
+
+def decode_config(data: bytes) -> AdvancedRiskConfig:
+    """Rebuild a config from encode_config output"""
+    values = orjson.loads(data)
+    values["aircraft_category"] = AircraftCategory(values["aircraft_category"])
+    values["risk_profile"] = RiskProfile(values["risk_profile"])
+    return AdvancedRiskConfig(**values)
 
 # Default configuration instances
 DEFAULT_CONFIG = AdvancedRiskConfig()
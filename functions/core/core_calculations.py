@@ -22,14 +22,136 @@ route planning capabilities using these core calculations.
 """
 
 import math
+import logging
 import numpy as np
+from enum import IntEnum
+from bisect import bisect_right
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, NamedTuple, Tuple, Optional, Any
 from .time_factors import calculate_time_risk_factor
-from ..config.advanced_config import AdvancedRiskConfig
+from ..config.advanced_config import AdvancedRiskConfig, ThresholdIdx
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels below run as plain Python without it
+    prange = range
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Effective runway length is divided by these factors for each surface contamination type
+CONTAMINATION_MULTIPLIERS = {
+    "dry": 1.0,
+    "wet": 1.15,
+    "standing_water": 1.4,
+    "slush": 1.6,
+    "snow": 1.8,
+    "ice": 2.2
+}
+
+# Step scores for low ceiling (ft AGL) and visibility (SM): a value below LIMITS[i] (scaled by the
+# config threshold multiplier) and not below LIMITS[i-1] scores SCORES[i]; at or above the last limit scores 0
+CEILING_LIMITS = (500, 1000, 2000, 3000)
+VISIBILITY_LIMITS = (1, 2, 3, 5)
+CEILING_VISIBILITY_SCORES = (40, 30, 20, 10, 0)
+
+@lru_cache(maxsize=32)
+def _scaled_limits(limits, mult):
+    return tuple(limit / mult for limit in limits)
+
+def _step_score(value, limits, scores, mult=1.0):
+    """Score for value from a step table, found with one binary search instead of an if/elif ladder"""
+    return scores[bisect_right(_scaled_limits(limits, mult), value)]
+
+@njit(inline="always")
+def _step_score_kernel(value, limits, scores, mult):
+    """_step_score for the kernels, which read the same tables as compile-time constants"""
+    for k in range(len(limits)):
+        if value < limits[k] / mult:
+            return scores[k]
+    return scores[len(limits)]
+
+class ContributorId(IntEnum):
+    """Column index of each risk contributor in the batched (N, K) contributor score arrays"""
+    TAILWIND = 0
+    CROSSWIND = 1
+    GUST_DIFFERENTIAL = 2
+    GUST_TAILWIND = 3
+    GUST_CROSSWIND = 4
+    DENSITY_ALTITUDE_DIFF = 5
+    THERMAL_GRADIENT = 6
+    ATMOSPHERIC_STABILITY = 7
+    RUNWAY_PERFORMANCE = 8
+    PRECIPITATION_INTENSITY = 9
+    TURBULENCE_RISK = 10
+    TREND_ANALYSIS = 11
+    TIME_OF_DAY = 12
+    ICING_CONDITIONS = 13
+    TEMPERATURE_PERFORMANCE = 14
+    WIND_SHEAR_RISK = 15
+    ENHANCED_WEATHER = 16
+    VOLCANIC_ASH = 17
+    NOTAM_RISKS = 18
+    THUNDERSTORM = 19
+    LIGHTNING = 20
+    LOW_CEILING = 21
+    LOW_VISIBILITY = 22
+    HAIL = 23
+    FUNNEL_CLOUD = 24
+    FREEZING_PRECIPITATION = 25
+    HEAVY_PRECIPITATION = 26
+    RISK_AMPLIFICATION = 27
+
+class AirportStateIdx(IntEnum):
+    """
+    Column index of each per-airport weather/NOTAM input in the batch kernel's airport state array
+    (flags are stored as 0.0/1.0, a missing dewpoint as NaN)
+    """
+    DEWPOINT_C = 0
+    CONTAMINATION_FACTOR = 1
+    TERRAIN_FACTOR = 2
+    TREND_COLD = 3
+    TREND_HOT = 4
+    HAS_CLOUDS = 5
+    WX_FREEZING = 6
+    WX_ICE_PELLETS = 7
+    WX_LIGHTNING = 8
+    WX_HAIL = 9
+    WX_HEAVY = 10
+    PRECIP_SCORE = 11
+    WIND_SHEAR_SCORE = 12
+    ENHANCED_WX_SCORE = 13
+    NOTAM_SCORE = 14
+
+# Contributor dict keys used by the scalar functions, indexed by ContributorId
+CONTRIBUTOR_NAMES = tuple(contributor.name.lower() for contributor in ContributorId)
+
+class Contributor(NamedTuple):
+    """
+    Immutable form of one contributors entry, as held in the advanced RRI cache (a reason list is
+    kept as a tuple); the RRI functions hand out the dict form from as_dict()
+    """
+    score: float
+    value: Any
+    unit: str
+    
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "Contributor":
+        value = entry["value"]
+        return cls(entry["score"], tuple(value) if isinstance(value, list) else value, entry["unit"])
+    
+    def as_dict(self) -> Dict[str, Any]:
+        value = list(self.value) if isinstance(self.value, tuple) else self.value
+        return {"score": self.score, "value": value, "unit": self.unit}
 
 class AdvancedAtmosphericModel:
     """Atmospheric condition modeling for better risk assessment"""
+    __slots__ = ()
     
     @staticmethod
     def calculate_thermal_gradient_risk(temp_c: float, dewpoint_c: Optional[float], time_of_day: str, config) -> Tuple[int, List[str]]:
@@ -81,6 +203,7 @@ class AdvancedAtmosphericModel:
 
 class PerformanceRiskAnalyzer:
     """Aircraft performance risk analysis"""
+    __slots__ = ()
     
     @staticmethod
     def calculate_runway_performance_risk(runway_length: Optional[int], da_diff: int, 
@@ -107,16 +230,7 @@ class PerformanceRiskAnalyzer:
                 reasons.append("Runway length unknown - verify runway adequacy for current density altitude")
             return score, reasons
         
-        contamination_multipliers = {
-            "dry": 1.0,
-            "wet": 1.15,
-            "standing_water": 1.4,
-            "slush": 1.6,
-            "snow": 1.8,
-            "ice": 2.2
-        }
-        
-        effective_runway = runway_length / contamination_multipliers.get(contamination, 1.0)
+        effective_runway = runway_length / CONTAMINATION_MULTIPLIERS.get(contamination, 1.0)
         
         if da_diff > 1000:
             performance_degradation = 1 + (da_diff / 10000)
@@ -147,61 +261,65 @@ class PerformanceRiskAnalyzer:
     
     @staticmethod
     def calculate_weight_performance_factor(da_diff: int, temp_c: float) -> float:
-        isa_temp = 15 - (2 * (da_diff / 1000))
-        temp_deviation = temp_c - isa_temp
-        
-        degradation_factor = 1 + (da_diff * 0.0001) + (max(0, temp_deviation) * 0.005)
-        return degradation_factor
+        return _weight_performance_kernel(float(da_diff), float(temp_c))
+
+# Precipitation codes by intensity, checked heavy -> moderate -> light with the first code found in a
+# weather group deciding its score (so "+TSRA" scores as heavy thunderstorm rain, not heavy rain)
+_PRECIP_INTENSITY_TABLE = (
+    (
+        ("+RA", "Heavy rain", 20),
+        ("+SN", "Heavy snow", 25),
+        ("+TSRA", "Heavy thunderstorm rain", 35),
+        ("+FZRA", "Heavy freezing rain", 40),
+        ("+PL", "Heavy ice pellets", 30),
+        ("+GR", "Heavy hail", 50),
+    ),
+    (
+        ("RA", "Rain", 8),
+        ("SN", "Snow", 12),
+        ("TSRA", "Thunderstorm rain", 18),
+        ("FZRA", "Freezing rain", 25),
+        ("PL", "Ice pellets", 15),
+    ),
+    (
+        ("-RA", "Light rain", 3),
+        ("-SN", "Light snow", 5),
+        ("-FZRA", "Light freezing rain", 15),
+    ),
+)
+_PRECIP_REASON_FORMATS = (
+    "{} significantly impacts visibility and runway conditions",
+    "{} affects visibility and runway conditions",
+    "{} may affect runway conditions",
+)
+
+@lru_cache(maxsize=256)
+def _precip_intensity(condition):
+    """
+    (reason, points) for one weather group, or None if it has no scored precipitation.
+    METARs reuse a small set of groups, so each distinct group is matched once.
+    """
+    for reason_format, precip_types in zip(_PRECIP_REASON_FORMATS, _PRECIP_INTENSITY_TABLE):
+        for precip_code, description, points in precip_types:
+            if precip_code in condition:
+                return reason_format.format(description), points
+    return None
 
 class WeatherRiskAnalyzer:
     """Weather condition risk analysis"""
+    __slots__ = ()
     
     @staticmethod
     def calculate_precipitation_intensity_risk(weather: List[str]) -> Tuple[int, List[str]]:
         score = 0
         reasons = []
         
-        heavy_precip_types = {
-            "+RA": ("Heavy rain", 20),
-            "+SN": ("Heavy snow", 25),
-            "+TSRA": ("Heavy thunderstorm rain", 35),
-            "+FZRA": ("Heavy freezing rain", 40),
-            "+PL": ("Heavy ice pellets", 30),
-            "+GR": ("Heavy hail", 50)
-        }
-        
-        moderate_precip_types = {
-            "RA": ("Rain", 8),
-            "SN": ("Snow", 12),
-            "TSRA": ("Thunderstorm rain", 18),
-            "FZRA": ("Freezing rain", 25),
-            "PL": ("Ice pellets", 15)
-        }
-        
-        light_precip_types = {
-            "-RA": ("Light rain", 3),
-            "-SN": ("Light snow", 5),
-            "-FZRA": ("Light freezing rain", 15)
-        }
-        
         for condition in weather:
-            for precip_code, (description, points) in heavy_precip_types.items():
-                if precip_code in condition:
-                    score += points
-                    reasons.append(f"{description} significantly impacts visibility and runway conditions")
-                    break
-            else:
-                for precip_code, (description, points) in moderate_precip_types.items():
-                    if precip_code in condition:
-                        score += points
-                        reasons.append(f"{description} affects visibility and runway conditions")
-                        break
-                else:
-                    for precip_code, (description, points) in light_precip_types.items():
-                        if precip_code in condition:
-                            score += points
-                            reasons.append(f"{description} may affect runway conditions")
-                            break
+            match = _precip_intensity(condition)
+            if match is not None:
+                reason, points = match
+                score += points
+                reasons.append(reason)
         
         return min(score, 50), reasons
     
@@ -248,20 +366,20 @@ class WeatherRiskAnalyzer:
 
 class RiskCorrelationEngine:
     """Risk correlation and amplification analysis"""
+    __slots__ = ()
     
     @staticmethod
-    def calculate_risk_amplification(contributors: Dict[str, Any]) -> Tuple[int, List[str]]:
+    def calculate_risk_amplification(contributors: Dict[str, Any], wind_score: float, weather_score: float,
+                                     performance_score: float) -> Tuple[int, List[str]]:
+        """
+        The domain scores are the summed contributor scores per risk domain, kept as running totals by
+        the caller: wind (tailwind, crosswind, gust differential/tailwind/crosswind), weather
+        (thunderstorm, lightning, low ceiling/visibility, icing) and performance (density altitude,
+        temperature performance).
+        """
         amplification_score = 0
         reasons = []
         
-        wind_risks = ["tailwind", "crosswind", "gust_differential", "gust_tailwind", "gust_crosswind"]
-        weather_risks = ["thunderstorm", "lightning", "low_ceiling", "low_visibility", "icing_conditions"]
-        performance_risks = ["density_altitude_diff", "temperature_performance"]
-        
-        wind_score = sum(contributors.get(risk, {}).get("score", 0) for risk in wind_risks)
-        weather_score = sum(contributors.get(risk, {}).get("score", 0) for risk in weather_risks)
-        performance_score = sum(contributors.get(risk, {}).get("score", 0) for risk in performance_risks)
-        
         active_domains = sum([
             wind_score > 20,
             weather_score > 20,
@@ -288,9 +406,11 @@ class RiskCorrelationEngine:
 
 class PredictiveRiskModel:
     """Predictive modeling for evolving conditions"""
+    __slots__ = ()
     
     @staticmethod
-    def calculate_trend_risk(current_conditions: Dict, historical_trend: Optional[Dict] = None) -> Tuple[int, List[str]]:
+    def calculate_trend_risk(current_conditions: Dict, historical_trend: Optional[Dict] = None,
+                             current_hour: Optional[int] = None) -> Tuple[int, List[str]]:
         score = 0
         reasons = []
         
@@ -307,62 +427,207 @@ class PredictiveRiskModel:
                 reasons.append("Pressure dropping - weather deterioration possible")
         
         temp_trend = historical_trend.get("temp_trend")
-        current_hour = datetime.utcnow().hour
-        if temp_trend and current_hour in range(14, 18):
+        if current_hour is None:
+            current_hour = datetime.utcnow().hour
+        if temp_trend and 14 <= current_hour < 18:
             if temp_trend > 3 and current_conditions.get("temp_c", 0) > 25:
                 score += 10
                 reasons.append("Rapid afternoon heating increases convective activity risk")
         
         return min(score, 20), reasons
 
-def pressure_alt(field_elev_ft, altim_in_hg):
+# Numeric kernels are compiled eagerly for float64 inputs (and cached on disk), so there is no
+# type dispatch or first-call compile on the request path. No fastmath: results must stay bit-identical.
+# Standard atmosphere: 15°C at sea level, falling 2°C per 1000 ft. Module constants are frozen into the
+# kernels at compile time, and the ISA kernel is inlined into its callers, so this costs nothing per call
+ISA_SEA_LEVEL_TEMP_C = 15
+ISA_LAPSE_RATE_C_PER_1000FT = 2
+
+@njit("float64(float64)", cache=True)
+def _isa_temp_kernel(altitude_ft):
+    return ISA_SEA_LEVEL_TEMP_C - ISA_LAPSE_RATE_C_PER_1000FT * (altitude_ft / 1000)
+
+@njit("float64(float64, float64)", cache=True)
+def _pressure_alt_kernel(field_elev_ft, altim_in_hg):
     return field_elev_ft + (29.92 - altim_in_hg) * 1000
 
+def pressure_alt(field_elev_ft, altim_in_hg):
+    return _pressure_alt_kernel(float(field_elev_ft), float(altim_in_hg))
+
+@njit("float64(float64, float64, float64)", cache=True)
+def _density_alt_kernel(field_elev_ft, temp_c, altim_in_hg):
+    pa = _pressure_alt_kernel(field_elev_ft, altim_in_hg)
+    isa_temp = _isa_temp_kernel(field_elev_ft)
+    return pa + 120 * (temp_c - isa_temp)
+
+@njit("float64(float64, float64)", cache=True)
+def _weight_performance_kernel(da_diff, temp_c):
+    isa_temp = _isa_temp_kernel(da_diff)
+    temp_deviation = temp_c - isa_temp
+    return 1 + (da_diff * 0.0001) + (max(0.0, temp_deviation) * 0.005)
+
+# Rounding, magnitude and the head/tail sign are all done in the kernel with no branches, so the
+# wrappers are a single native call
+@njit("Tuple((int64, int64, boolean))(float64, float64, float64)", cache=True)
+def _wind_kernel(rwy_heading_deg, wind_dir_deg, speed_kt):
+    rad_diff = math.radians((wind_dir_deg - rwy_heading_deg) % 360)
+    head = speed_kt * math.cos(rad_diff)
+    cross = speed_kt * math.sin(rad_diff)
+    return round(abs(head)), round(abs(cross)), head >= 0
+
+# Mean wind and gust share a direction, so the angle and its cos/sin are computed once for both;
+# rounding and the head >= 0 test are those of _wind_kernel
+@njit("Tuple((int64, int64, boolean, int64, int64, boolean))(float64, float64, float64, float64)", cache=True)
+def _wind_gust_kernel(rwy_heading_deg, wind_dir_deg, speed_kt, gust_kt):
+    rad_diff = math.radians((wind_dir_deg - rwy_heading_deg) % 360)
+    cos_diff = math.cos(rad_diff)
+    sin_diff = math.sin(rad_diff)
+    head = speed_kt * cos_diff
+    gust_head = gust_kt * cos_diff
+    return (round(abs(head)), round(abs(speed_kt * sin_diff)), head >= 0,
+            round(abs(gust_head)), round(abs(gust_kt * sin_diff)), gust_head >= 0)
+
 def density_alt(field_elev_ft, temp_c, altim_in_hg):
-    if not isinstance(field_elev_ft, (int, float)) or not isinstance(temp_c, (int, float)) or not isinstance(altim_in_hg, (int, float)):
-        print(f"[density_alt] Invalid inputs: elev={field_elev_ft}, temp={temp_c}, altim={altim_in_hg}")
-        return 0
+    # Non-numeric inputs (None, strings, Decimal, ...) fail the range comparison or the kernel's
+    # float64 signature with a TypeError, so valid inputs skip the type checks entirely
+    try:
+        if temp_c < -60 or temp_c > 50:
+            logger.debug("density_alt temperature out of range: %s°C", temp_c)
+            return 0
         
-    if temp_c < -60 or temp_c > 50:
-        print(f"[density_alt] Temperature out of range: {temp_c}°C")
+        da = int(_density_alt_kernel(field_elev_ft, temp_c, altim_in_hg))
+    except TypeError:
+        logger.debug("density_alt invalid inputs: elev=%s, temp=%s, altim=%s", field_elev_ft, temp_c, altim_in_hg)
         return 0
-        
-    pa = pressure_alt(field_elev_ft, altim_in_hg)
-    isa_temp = 15 - 2 * (field_elev_ft / 1000)
-    da = int(pa + 120 * (temp_c - isa_temp))
     
     if da < -1000 or da > 20000:
-        print(f"[density_alt] Result out of range: {da}ft")
+        logger.debug("density_alt result out of range: %sft", da)
         return 0
         
     return da
 
+def density_alt_batch(field_elev_ft, temps_c, altims_in_hg):
+    """
+    Array version of density_alt for one field elevation: an int array of density altitudes, 0 where
+    the temperature or the result is out of range (those rows are not logged individually).
+    """
+    temps_c = np.asarray(temps_c, dtype=np.float64)
+    altims_in_hg = np.asarray(altims_in_hg, dtype=np.float64)
+    field_elev_ft = float(field_elev_ft)
+    
+    pa = field_elev_ft + (29.92 - altims_in_hg) * 1000
+    isa_temp = _isa_temp_kernel(field_elev_ft)
+    da = np.trunc(pa + 120 * (temps_c - isa_temp))
+    
+    valid = (temps_c >= -60) & (temps_c <= 50) & (da >= -1000) & (da <= 20000)
+    return np.where(valid, da, 0).astype(np.int64)
+
 def wind_components(rwy_heading_deg, wind_dir_deg, wind_speed_kt):
-    rad_diff = math.radians((wind_dir_deg - rwy_heading_deg) % 360)
-    head = wind_speed_kt * math.cos(rad_diff)
-    cross = wind_speed_kt * math.sin(rad_diff)
-    return round(abs(head)), round(abs(cross)), head >= 0
+    return _wind_kernel(float(rwy_heading_deg), float(wind_dir_deg), float(wind_speed_kt))
 
 def gust_components(rwy_heading_deg, wind_dir_deg, gust_speed_kt):
-    rad_diff = math.radians((wind_dir_deg - rwy_heading_deg) % 360)
-    head = gust_speed_kt * math.cos(rad_diff)
-    cross = gust_speed_kt * math.sin(rad_diff)
-    return round(abs(head)), round(abs(cross)), head >= 0
+    return _wind_kernel(float(rwy_heading_deg), float(wind_dir_deg), float(gust_speed_kt))
 
-def calculate_icing_risk(temp_c, metar_data):
+def wind_and_gust_components(rwy_heading_deg, wind_dir_deg, wind_speed_kt, gust_speed_kt):
+    """
+    wind_components and gust_components in one call:
+    (head, cross, is_head, gust_head, gust_cross, gust_is_head). A zero gust gives (0, 0, True).
+    """
+    return _wind_gust_kernel(float(rwy_heading_deg), float(wind_dir_deg), float(wind_speed_kt), float(gust_speed_kt))
+
+# One wind against every runway heading of an airport, per element through the scalar kernel (not
+# np.cos/np.sin, whose SIMD results can differ in the last bit and flip a rounding); airports have a
+# handful of runway ends, too few for threads to pay off
+@njit("Tuple((int64[::1], int64[::1], boolean[::1]))(float64[::1], float64, float64)", cache=True)
+def _runway_wind_batch_kernel(rwy_headings_deg, wind_dir_deg, speed_kt):
+    n = rwy_headings_deg.shape[0]
+    head = np.empty(n, dtype=np.int64)
+    cross = np.empty(n, dtype=np.int64)
+    is_head = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        head[i], cross[i], is_head[i] = _wind_kernel(rwy_headings_deg[i], wind_dir_deg, speed_kt)
+    return head, cross, is_head
+
+def runway_wind_components_batch(rwy_headings_deg, wind_dir_deg, wind_speed_kt):
+    """
+    wind_components of one wind for N runway headings: (head, cross, is_head) arrays.
+    A few headings are cheaper through wind_components when the results are wanted as Python values
+    (measured crossover ~8); the arrays pay off sooner when they feed a batch call directly.
+    """
+    return _runway_wind_batch_kernel(
+        np.ascontiguousarray(rwy_headings_deg, dtype=np.float64), float(wind_dir_deg), float(wind_speed_kt)
+    )
+
+# Runs the fused scalar kernel per element so batch components match wind_and_gust_components
+@njit("UniTuple(Array(int64, 1, 'C'), 4)(float64, float64[::1], float64[::1], float64[::1], boolean[::1], boolean[::1])",
+      parallel=True, cache=True)
+def _wind_gust_batch_kernel(rwy_heading_deg, wind_dir_deg, speed_kt, gust_kt, is_head, gust_is_head):
+    n = wind_dir_deg.shape[0]
+    head = np.empty(n, dtype=np.int64)
+    cross = np.empty(n, dtype=np.int64)
+    gust_head = np.empty(n, dtype=np.int64)
+    gust_cross = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        head[i], cross[i], is_head[i], gust_head[i], gust_cross[i], gust_is_head[i] = _wind_gust_kernel(
+            rwy_heading_deg, wind_dir_deg[i], speed_kt[i], gust_kt[i]
+        )
+    return head, cross, gust_head, gust_cross
+
+def wind_gust_components_batch(rwy_heading_deg, wind_dirs_deg, speeds_kt, gusts_kt):
+    """
+    Array version of wind_and_gust_components for N wind/speed/gust triples: (heads, crosses,
+    is_heads, gust_heads, gust_crosses, gust_is_heads) arrays.
+    """
+    n = len(wind_dirs_deg)
+    is_head = np.empty(n, dtype=np.bool_)
+    gust_is_head = np.empty(n, dtype=np.bool_)
+    head, cross, gust_head, gust_cross = _wind_gust_batch_kernel(
+        float(rwy_heading_deg), _batch_column(wind_dirs_deg, n), _batch_column(speeds_kt, n),
+        _batch_column(gusts_kt, n), is_head, gust_is_head
+    )
+    return head, cross, is_head, gust_head, gust_cross, gust_is_head
+
+# Every phenomenon code the risk checks look for; a code counts as reported when it appears anywhere
+# in one of the METAR weather groups (so "TS" matches "+TSRA")
+_WEATHER_CODES = ("+", "FZ", "FZRA", "IC", "PL", "TS", "SH", "LTG", "GR", "FC", "FG", "BR", "HZ",
+                  "DU", "SA", "DS", "VA", "SQ", "SN", "RA")
+
+@lru_cache(maxsize=256)
+def _weather_codes(weather):
+    groups = "\n".join(weather)
+    return frozenset(code for code in _WEATHER_CODES if code in groups)
+
+def weather_codes(weather):
+    """
+    The _WEATHER_CODES present in a METAR weather list, scanned once per distinct list, so each
+    check is a set lookup instead of another pass over the groups
+    """
+    return _weather_codes(tuple(weather))
+
+# Cloud cover that counts towards icing risk
+_ICING_CLOUD_TYPES = frozenset(("BKN", "OVC"))
+
+def has_icing_clouds(cloud_layers):
+    return any(layer.get("type") in _ICING_CLOUD_TYPES for layer in cloud_layers)
+
+def calculate_icing_risk(temp_c, metar_data, wx=None):
     score = 0
     reasons = []
     
-    weather = metar_data.get("weather", [])
+    if wx is None:
+        wx = weather_codes(metar_data.get("weather", []))
     cloud_layers = metar_data.get("cloud_layers", [])
     dewpoint_c = metar_data.get("dewpoint_c")
     
-    if any("FZ" in condition for condition in weather):
+    if "FZ" in wx:
         score += 30
         reasons.append("Freezing precipitation reported")
     
+    # Both cloud checks below only apply between -10°C and +5°C, so the layers are scanned at most once
+    icing_clouds = -10 <= temp_c <= 5 and has_icing_clouds(cloud_layers)
+    
     if -10 <= temp_c <= 2:
-        if any(layer.get("type") in ["BKN", "OVC"] for layer in cloud_layers):
+        if icing_clouds:
             if 0 <= temp_c <= 2:
                 score += 25
                 reasons.append("Prime icing conditions (0°C to +2°C with clouds)")
@@ -373,11 +638,11 @@ def calculate_icing_risk(temp_c, metar_data):
     if dewpoint_c is not None and temp_c is not None:
         dewpoint_spread = temp_c - dewpoint_c
         if dewpoint_spread <= 3 and -5 <= temp_c <= 5:
-            if any(layer.get("type") in ["BKN", "OVC"] for layer in cloud_layers):
+            if icing_clouds:
                 score += 15
                 reasons.append(f"High humidity (spread {dewpoint_spread}°C) with clouds in icing range")
     
-    if any("IC" in condition or "PL" in condition for condition in weather):
+    if "IC" in wx or "PL" in wx:
         score += 20
         reasons.append("Ice pellets reported")
     
@@ -407,349 +672,943 @@ def calculate_temperature_performance_risk(temp_c, da_diff):
     
     return min(score, 25), reasons
 
-def calculate_wind_shear_risk(metar_data, weather_data=None):
+def calculate_wind_shear_risk(metar_data, weather_data=None, wx=None):
     score = 0
     reasons = []
     
-    weather = metar_data.get("weather", [])
+    if wx is None:
+        wx = weather_codes(metar_data.get("weather", []))
     
-    if any("TS" in condition for condition in weather):
+    if "TS" in wx:
         score += 25
         reasons.append("Thunderstorm wind shear risk")
     
-    if any("SH" in condition for condition in weather):
+    if "SH" in wx:
         score += 15
         reasons.append("Shower activity indicates possible wind shear")
     
     return min(score, 25), reasons
 
-def parse_enhanced_weather_conditions(metar_data):
+def parse_enhanced_weather_conditions(metar_data, wx=None):
     score = 0
     reasons = []
     
-    weather = metar_data.get("weather", [])
+    if wx is None:
+        wx = weather_codes(metar_data.get("weather", []))
     
-    if any("FG" in condition for condition in weather):
+    if "FG" in wx:
         score += 15
         reasons.append("Fog conditions reduce visibility")
     
-    if any("BR" in condition or "HZ" in condition for condition in weather):
+    if "BR" in wx or "HZ" in wx:
         score += 5
         reasons.append("Mist or haze reducing visibility")
     
-    if any("DU" in condition or "SA" in condition or "DS" in condition for condition in weather):
+    if "DU" in wx or "SA" in wx or "DS" in wx:
         score += 20
         reasons.append("Dust or sand affecting visibility")
     
-    if any("VA" in condition for condition in weather):
+    if "VA" in wx:
         score += 100
         reasons.append("Volcanic ash - NO-GO condition")
     
-    if any("SQ" in condition for condition in weather):
+    if "SQ" in wx:
         score += 30
         reasons.append("Squall line activity")
     
     return score, reasons
 
-def parse_notam_risks(notam_data, runway_id):
-    if not notam_data:
-        return 0, []
-    
-    score = 0
-    reasons = []
-    
-    notam_text = notam_data.get("raw_text", "").upper() if isinstance(notam_data, dict) else str(notam_data).upper()
-    
-    if any(html_indicator in notam_text for html_indicator in ["<!DOCTYPE", "<HTML>", "INVALID QUERY", "ERROR", "<TITLE>"]):
-        return 0, []
-    
-    if len(notam_text.strip()) < 50 or "NOTAM" not in notam_text:
-        return 0, []
-    
-    if any(keyword in notam_text for keyword in ["SNOW", "ICE", "SLUSH", "WET", "CONTAMINATED"]):
-        score += 20
-        reasons.append("Runway contamination reported in NOTAMs")
-    
-    if any(keyword in notam_text for keyword in ["ILS", "PAPI", "VASI", "LIGHTS", "BEACON"]):
-        score += 10
-        reasons.append("Navigation/lighting equipment outage")
-    
-    if any(keyword in notam_text for keyword in ["CONSTRUCTION", "OBSTACLE", "WORK IN PROGRESS"]):
-        score += 15
-        reasons.append("Construction or obstacles reported")
-    
-    return min(score, 25), reasons
+def _no_go_contributors(wx):
+    """
+    Contributors for weather that pins the advanced RRI at 100 on its own (volcanic ash,
+    thunderstorm, funnel cloud); empty when none of them is reported.
+    """
+    contributors = {}
+    if "VA" in wx:
+        contributors["volcanic_ash"] = {"score": 100, "value": ["Volcanic ash - NO-GO condition"], "unit": "conditions"}
+    if "TS" in wx:
+        contributors["thunderstorm"] = {"score": 100, "value": True, "unit": "boolean"}
+    if "FC" in wx:
+        contributors["funnel_cloud"] = {"score": 100, "value": True, "unit": "boolean"}
+    return contributors
 
-def calculate_advanced_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, 
-                          da_diff, metar_data, lat=None, lon=None, rwy_heading=None, notam_data=None,
-                          runway_length=None, airport_elevation=None, terrain_factor=1.0, 
-                          historical_trend=None, aircraft_category="light", config=None):
+def _wind_da_contributors(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head,
+                          da_diff, mult=1.0, truncate=False):
     """
-    Comprehensive Runway Risk Index calculation with improved modeling
-    
-    This is the full-featured version - the old calculate_rri function is maintained for backward compatibility
+    Wind, gust and density altitude contributors shared by calculate_rri and calculate_advanced_rri:
+    (wind_score, da_score, contributors). Thresholds are scaled by mult; with truncate the scaled
+    scores are cut to ints as the advanced RRI does, otherwise they stay fractional as in calculate_rri.
     """
-    if config is None:
-        config = AdvancedRiskConfig()
-    
-    score = 0
+    wind_score = 0
+    da_score = 0
     contributors = {}
     
-    temp_c = metar_data.get("temp_c", 15)
-    dewpoint_c = metar_data.get("dewpoint_c")
-    weather = metar_data.get("weather", [])
-    ceiling = metar_data.get("ceiling")
-    visibility = metar_data.get("visibility")
-    
-    current_hour = datetime.utcnow().hour
-    if 6 <= current_hour < 10:
-        time_of_day = "early_morning"
-    elif 10 <= current_hour < 14:
-        time_of_day = "midday"
-    elif 14 <= current_hour < 18:
-        time_of_day = "afternoon"
-    elif 18 <= current_hour < 22:
-        time_of_day = "evening"
-    else:
-        time_of_day = "late_evening"
-    
-    atm_model = AdvancedAtmosphericModel()
-    perf_analyzer = PerformanceRiskAnalyzer()
-    weather_analyzer = WeatherRiskAnalyzer()
-    correlation_engine = RiskCorrelationEngine()
-    predictive_model = PredictiveRiskModel()
-    
     if not is_head:
         tailwind_score = min(30, head * 6)
         if tailwind_score > 0:
             contributors["tailwind"] = {"score": tailwind_score, "value": head, "unit": "kt"}
-            score += tailwind_score
+            wind_score += tailwind_score
     if cross > 0:
-        crosswind_threshold = 15 * config.threshold_multiplier
-        crosswind_score = min(30, int((cross / crosswind_threshold) * 30))
+        crosswind_score = min(30, (cross / (15 * mult)) * 30)
+        if truncate:
+            crosswind_score = int(crosswind_score)
         if crosswind_score > 0:
             contributors["crosswind"] = {"score": crosswind_score, "value": cross, "unit": "kt"}
-            score += crosswind_score
-        
+            wind_score += crosswind_score
+    
     if wind_gust > 0:
         gust_diff_val = wind_gust - wind_speed
-        gust_threshold = 10 * config.threshold_multiplier
-        gust_diff_score = min(20, int((gust_diff_val / gust_threshold) * 20))
+        gust_diff_score = min(20, (gust_diff_val / (10 * mult)) * 20)
+        if truncate:
+            gust_diff_score = int(gust_diff_score)
         if gust_diff_score > 0:
             contributors["gust_differential"] = {"score": gust_diff_score, "value": gust_diff_val, "unit": "kt"}
-            score += gust_diff_score
+            wind_score += gust_diff_score
         
         if not gust_is_head:
-            gust_tailwind_threshold = 10 * config.threshold_multiplier
-            gust_tailwind_score = min(10, int((gust_head / gust_tailwind_threshold) * 10))
+            gust_tailwind_score = min(10, (gust_head / (10 * mult)) * 10)
+            if truncate:
+                gust_tailwind_score = int(gust_tailwind_score)
             if gust_tailwind_score > 0:
                 contributors["gust_tailwind"] = {"score": gust_tailwind_score, "value": gust_head, "unit": "kt"}
-                score += gust_tailwind_score
+                wind_score += gust_tailwind_score
         if gust_cross > 0:
-            gust_crosswind_threshold = 20 * config.threshold_multiplier
-            gust_crosswind_score = min(10, int((gust_cross / gust_crosswind_threshold) * 10))
+            gust_crosswind_score = min(10, (gust_cross / (20 * mult)) * 10)
+            if truncate:
+                gust_crosswind_score = int(gust_crosswind_score)
             if gust_crosswind_score > 0:
                 contributors["gust_crosswind"] = {"score": gust_crosswind_score, "value": gust_cross, "unit": "kt"}
-                score += gust_crosswind_score
-            
+                wind_score += gust_crosswind_score
+    
     if da_diff > 0:
-        da_threshold = 2000 * config.threshold_multiplier
-        da_score = min(30, int((da_diff / da_threshold) * 30))
+        da_score = min(30, (da_diff / (2000 * mult)) * 30)
+        if truncate:
+            da_score = int(da_score)
         if da_score > 0:
             contributors["density_altitude_diff"] = {"score": da_score, "value": da_diff, "unit": "ft"}
-            score += da_score
     
-    thermal_score, thermal_reasons = atm_model.calculate_thermal_gradient_risk(temp_c, dewpoint_c, time_of_day, config)
+    return wind_score, da_score, contributors
+
+def parse_notam_risks(notam_data, runway_id):
+    if not notam_data:
+        return 0, []
+    
+    notam_text = notam_data.get("raw_text", "") if isinstance(notam_data, dict) else str(notam_data)
+    score, reasons = _notam_risks(*_notam_keywords(notam_text))
+    return score, list(reasons)
+
+# NOTAM risk categories: the keywords that report each one, its score and its reason
+_NOTAM_RISK_CATEGORIES = (
+    (("SNOW", "ICE", "SLUSH", "WET", "CONTAMINATED"), 20, "Runway contamination reported in NOTAMs"),
+    (("ILS", "PAPI", "VASI", "LIGHTS", "BEACON"), 10, "Navigation/lighting equipment outage"),
+    (("CONSTRUCTION", "OBSTACLE", "WORK IN PROGRESS"), 15, "Construction or obstacles reported")
+)
+# Markers of an error page returned in place of NOTAM text
+_NOTAM_ERROR_MARKERS = ("<!DOCTYPE", "<HTML>", "INVALID QUERY", "ERROR", "<TITLE>")
+# Every keyword the NOTAM risk and contamination checks look for
+_NOTAM_KEYWORDS = _NOTAM_ERROR_MARKERS + ("NOTAM", "STANDING WATER") + tuple(
+    keyword for keywords, _, _ in _NOTAM_RISK_CATEGORIES for keyword in keywords
+)
+
+# The same NOTAM text is checked for every runway and every RRI evaluation of a request, and by both
+# the risk and the contamination checks, so it is uppercased and scanned once per distinct text
+@lru_cache(maxsize=64)
+def _notam_keywords(notam_text):
+    """The _NOTAM_KEYWORDS in a NOTAM text (ignoring case) and the length of the stripped text"""
+    notam_text = notam_text.upper()
+    return frozenset(keyword for keyword in _NOTAM_KEYWORDS if keyword in notam_text), len(notam_text.strip())
+
+@lru_cache(maxsize=64)
+def _notam_risks(keywords, length):
+    """NOTAM risk score and reasons from a text's _notam_keywords"""
+    score = 0
+    reasons = []
+    
+    if not keywords.isdisjoint(_NOTAM_ERROR_MARKERS):
+        return 0, ()
+    
+    if length < 50 or "NOTAM" not in keywords:
+        return 0, ()
+    
+    for category_keywords, category_score, reason in _NOTAM_RISK_CATEGORIES:
+        if not keywords.isdisjoint(category_keywords):
+            score += category_score
+            reasons.append(reason)
+    
+    return min(score, 25), tuple(reasons)
+
+# Time-of-day period for each UTC hour
+_TIME_OF_DAY = (("late_evening",) * 6 + ("early_morning",) * 4 + ("midday",) * 4
+                + ("afternoon",) * 4 + ("evening",) * 4 + ("late_evening",) * 2)
+
+def get_time_of_day(current_hour):
+    return _TIME_OF_DAY[current_hour]
+
+def get_runway_contamination(weather, notam_data):
+    notam_keywords = None
+    if notam_data and isinstance(notam_data, dict):
+        notam_keywords, _ = _notam_keywords(notam_data.get("raw_text", ""))
+    return _runway_contamination(weather_codes(weather), notam_keywords)
+
+def _runway_contamination(wx, notam_keywords):
+    """
+    Contamination from an already-scanned weather code set; the NOTAM keywords (None when there is
+    no NOTAM dict) are only consulted when the weather reports none
+    """
+    if "SN" in wx:
+        return "snow"
+    elif "FZRA" in wx:
+        return "ice"
+    elif "RA" in wx:
+        return "wet"
+    elif notam_keywords is not None:
+        return _notam_contamination(notam_keywords)
+    return "dry"
+
+def _notam_contamination(keywords):
+    if "ICE" in keywords or "SLUSH" in keywords:
+        return "ice"
+    elif "SNOW" in keywords:
+        return "snow"
+    elif "WET" in keywords or "STANDING WATER" in keywords:
+        return "wet"
+    return "dry"
+
+def calculate_advanced_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, 
+                          da_diff, metar_data, lat=None, lon=None, rwy_heading=None, notam_data=None,
+                          runway_length=None, airport_elevation=None, terrain_factor=1.0, 
+                          historical_trend=None, aircraft_category="light", config=None, now=None):
+    """
+    Comprehensive Runway Risk Index calculation with improved modeling
+    
+    This is the full-featured version - the old calculate_rri function is maintained for backward compatibility
+    Pass now (UTC) to evaluate several runways or scenarios of one request at the same instant.
+    
+    Results are memoized on the values the calculation reads (wind components, the METAR temperature,
+    dewpoint, weather, ceiling, visibility and cloud types, the NOTAM keywords, ...): the same observation
+    is scored for every runway and by every request until the next one. Only the sun position is
+    worked out on every call.
+    """
+    if config is None:
+        config = AdvancedRiskConfig()
+    
+    weather = metar_data.get("weather", [])
+    
+    # Nothing else can move a pinned score, so skip the rest of the analysis
+    no_go = _no_go_contributors(weather_codes(weather))
+    if no_go:
+        return 100, no_go
+    
+    if now is None:
+        now = datetime.utcnow()
+    time_risk = None
+    if lat is not None and lon is not None and rwy_heading is not None:
+        time_factors = calculate_time_risk_factor(now, lat, lon, rwy_heading)
+        time_risk = (time_factors["time_risk_points"], time_factors["time_period"])
+    
+    # Only the raw text of a NOTAM dict is read (any other NOTAM value as str()), and only through its
+    # keywords, so the memo is keyed on those rather than holding on to the (often page-sized) text
+    notam = None
+    if notam_data:
+        notam = _notam_keywords(notam_data.get("raw_text", "") if isinstance(notam_data, dict) else str(notam_data))
+    trend = None
+    if historical_trend:
+        trend = (historical_trend.get("pressure_trend"), historical_trend.get("temp_trend"))
+    
+    inputs = (
+        head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff,
+        metar_data.get("temp_c", 15), metar_data.get("dewpoint_c"), tuple(weather),
+        metar_data.get("ceiling"), metar_data.get("visibility"),
+        tuple(layer.get("type") for layer in metar_data.get("cloud_layers") or ()),
+        isinstance(notam_data, dict), notam, runway_length, terrain_factor, trend,
+        config, now.hour, time_risk
+    )
+    try:
+        hash(inputs)
+    except TypeError:
+        # Inputs that can't be hashed (numpy arrays, say) are scored without the cache
+        return _advanced_rri(*inputs)
+    score, contributors = _cached_advanced_rri(*inputs)
+    return score, {name: contributor.as_dict() for name, contributor in contributors}
+
+@lru_cache(maxsize=4096, typed=True)
+def _cached_advanced_rri(*inputs):
+    # Contributors are cached in their immutable form so cached results can't be changed by callers
+    score, contributors = _advanced_rri(*inputs)
+    return score, tuple((name, Contributor.from_dict(entry)) for name, entry in contributors.items())
+
+def _advanced_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff,
+                  temp_c, dewpoint_c, weather, ceiling, visibility, cloud_types, notam_is_dict, notam,
+                  runway_length, terrain_factor, trend, config, current_hour, time_risk):
+    """
+    calculate_advanced_rri for weather that doesn't pin the score at 100, from the METAR and trend
+    values it reads, the NOTAM's _notam_keywords (None without a NOTAM), the UTC hour and the
+    sun-position risk, (points, period) or None
+    """
+    # The METAR, NOTAM and trend checks take dicts; these carry just the fields they read
+    metar_data = {
+        "temp_c": temp_c, "dewpoint_c": dewpoint_c, "weather": list(weather),
+        "cloud_layers": [{"type": cloud_type} for cloud_type in cloud_types]
+    }
+    historical_trend = None
+    if trend is not None:
+        historical_trend = {"pressure_trend": trend[0], "temp_trend": trend[1]}
+    
+    wx = weather_codes(weather)
+    
+    # Per-domain running totals for the risk amplification check
+    wind_score, da_score, contributors = _wind_da_contributors(
+        head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff,
+        config.threshold_multiplier, truncate=True
+    )
+    score = wind_score + da_score
+    performance_score = da_score
+    weather_score = 0
+    
+    time_of_day = get_time_of_day(current_hour)
+    
+    thermal_score, thermal_reasons = AdvancedAtmosphericModel.calculate_thermal_gradient_risk(temp_c, dewpoint_c, time_of_day, config)
     if thermal_score > 0:
         contributors["thermal_gradient"] = {"score": thermal_score, "value": thermal_reasons, "unit": "conditions"}
         score += thermal_score
     
-    stability_score, stability_reasons = atm_model.calculate_stability_index(temp_c, dewpoint_c, wind_speed, config)
+    stability_score, stability_reasons = AdvancedAtmosphericModel.calculate_stability_index(temp_c, dewpoint_c, wind_speed, config)
     if stability_score > 0:
         contributors["atmospheric_stability"] = {"score": stability_score, "value": stability_reasons, "unit": "conditions"}
         score += stability_score
     
-    contamination = "dry"
-    if any("SN" in condition for condition in weather):
-        contamination = "snow"
-    elif any("FZRA" in condition for condition in weather):
-        contamination = "ice"
-    elif any("RA" in condition for condition in weather):
-        contamination = "wet"
-    elif notam_data and isinstance(notam_data, dict):
-        notam_text = notam_data.get("raw_text", "").upper()
-        if any(keyword in notam_text for keyword in ["ICE", "SLUSH"]):
-            contamination = "ice"
-        elif any(keyword in notam_text for keyword in ["SNOW"]):
-            contamination = "snow"
-        elif any(keyword in notam_text for keyword in ["WET", "STANDING WATER"]):
-            contamination = "wet"
-    
-    perf_score, perf_reasons = perf_analyzer.calculate_runway_performance_risk(runway_length, da_diff, contamination, config)
+    contamination = _runway_contamination(wx, notam[0] if notam_is_dict and notam is not None else None)
+    
+    perf_score, perf_reasons = PerformanceRiskAnalyzer.calculate_runway_performance_risk(runway_length, da_diff, contamination, config)
     if perf_score > 0:
         contributors["runway_performance"] = {"score": perf_score, "value": perf_reasons, "unit": "conditions"}
         score += perf_score
     
-    precip_score, precip_reasons = weather_analyzer.calculate_precipitation_intensity_risk(weather)
+    precip_score, precip_reasons = WeatherRiskAnalyzer.calculate_precipitation_intensity_risk(weather)
     if precip_score > 0:
         contributors["precipitation_intensity"] = {"score": precip_score, "value": precip_reasons, "unit": "conditions"}
         score += precip_score
     
-    turb_score, turb_reasons = weather_analyzer.calculate_turbulence_risk(wind_speed, wind_gust, terrain_factor, config)
+    turb_score, turb_reasons = WeatherRiskAnalyzer.calculate_turbulence_risk(wind_speed, wind_gust, terrain_factor, config)
     if turb_score > 0:
         contributors["turbulence_risk"] = {"score": turb_score, "value": turb_reasons, "unit": "conditions"}
         score += turb_score
     
     if historical_trend:
-        trend_score, trend_reasons = predictive_model.calculate_trend_risk(metar_data, historical_trend)
+        trend_score, trend_reasons = PredictiveRiskModel.calculate_trend_risk(metar_data, historical_trend, current_hour)
         if trend_score > 0:
             contributors["trend_analysis"] = {"score": trend_score, "value": trend_reasons, "unit": "conditions"}
             score += trend_score
     
-    if lat is not None and lon is not None and rwy_heading is not None:
-        time_factors = calculate_time_risk_factor(datetime.utcnow(), lat, lon, rwy_heading)
-        if time_factors["time_risk_points"] > 0:
-            contributors["time_of_day"] = {"score": time_factors["time_risk_points"], "value": time_factors["time_period"], "unit": "condition"}
-            score += time_factors["time_risk_points"]
+    if time_risk is not None:
+        time_points, time_period = time_risk
+        if time_points > 0:
+            contributors["time_of_day"] = {"score": time_points, "value": time_period, "unit": "condition"}
+            score += time_points
     
-    icing_score, icing_reasons = calculate_icing_risk(temp_c, metar_data)
+    icing_score, icing_reasons = calculate_icing_risk(temp_c, metar_data, wx)
     if icing_score > 0:
         contributors["icing_conditions"] = {"score": icing_score, "value": icing_reasons, "unit": "conditions"}
         score += icing_score
+        weather_score += icing_score
     
     temp_perf_score, temp_perf_reasons = calculate_temperature_performance_risk(temp_c, da_diff)
     if temp_perf_score > 0:
         contributors["temperature_performance"] = {"score": temp_perf_score, "value": temp_perf_reasons, "unit": "conditions"}
         score += temp_perf_score
+        performance_score += temp_perf_score
     
-    ws_score, ws_reasons = calculate_wind_shear_risk(metar_data)
+    ws_score, ws_reasons = calculate_wind_shear_risk(metar_data, wx=wx)
     if ws_score > 0:
         contributors["wind_shear_risk"] = {"score": ws_score, "value": ws_reasons, "unit": "conditions"}
         score += ws_score
     
-    enhanced_wx_score, enhanced_wx_reasons = parse_enhanced_weather_conditions(metar_data)
+    enhanced_wx_score, enhanced_wx_reasons = parse_enhanced_weather_conditions(metar_data, wx)
     if enhanced_wx_score > 0:
-        if enhanced_wx_score >= 100:
-            contributors["volcanic_ash"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
-            score = 100
-        else:
-            contributors["enhanced_weather"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
-            score += enhanced_wx_score
+        contributors["enhanced_weather"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
+        score += enhanced_wx_score
     
-    notam_score, notam_reasons = parse_notam_risks(notam_data, rwy_heading)
+    notam_score, notam_reasons = _notam_risks(*notam) if notam is not None else (0, ())
     if notam_score > 0:
-        contributors["notam_risks"] = {"score": notam_score, "value": notam_reasons, "unit": "conditions"}
+        contributors["notam_risks"] = {"score": notam_score, "value": list(notam_reasons), "unit": "conditions"}
         score += notam_score
     
-    if any("TS" in weather_condition for weather_condition in weather):
-        contributors["thunderstorm"] = {"score": 100, "value": True, "unit": "boolean"}
-        score = 100
-        
-    if any("LTG" in weather_condition for weather_condition in weather):
+    if "LTG" in wx:
         contributors["lightning"] = {"score": 25, "value": True, "unit": "boolean"}
         score += 25
+        weather_score += 25
         
     if score < 100 and ceiling is not None:
-        ceiling_score = 0
-        if ceiling < (500 / config.threshold_multiplier):
-            ceiling_score = 40
-        elif ceiling < (1000 / config.threshold_multiplier):
-            ceiling_score = 30
-        elif ceiling < (2000 / config.threshold_multiplier):
-            ceiling_score = 20
-        elif ceiling < (3000 / config.threshold_multiplier):
-            ceiling_score = 10
+        ceiling_score = _step_score(ceiling, CEILING_LIMITS, CEILING_VISIBILITY_SCORES, config.threshold_multiplier)
         if ceiling_score > 0:
             contributors["low_ceiling"] = {"score": ceiling_score, "value": ceiling, "unit": "ft AGL"}
             score += ceiling_score
+            weather_score += ceiling_score
             
     if score < 100 and visibility is not None:
-        visibility_score = 0
-        if visibility < (1 / config.threshold_multiplier):
-            visibility_score = 40
-        elif visibility < (2 / config.threshold_multiplier):
-            visibility_score = 30
-        elif visibility < (3 / config.threshold_multiplier):
-            visibility_score = 20
-        elif visibility < (5 / config.threshold_multiplier):
-            visibility_score = 10
+        visibility_score = _step_score(visibility, VISIBILITY_LIMITS, CEILING_VISIBILITY_SCORES, config.threshold_multiplier)
         if visibility_score > 0:
             contributors["low_visibility"] = {"score": visibility_score, "value": visibility, "unit": "SM"}
             score += visibility_score
+            weather_score += visibility_score
     
     if score < 100:
-        if any("GR" in weather_condition for weather_condition in weather):
+        if "GR" in wx:
             contributors["hail"] = {"score": 40, "value": True, "unit": "boolean"}
             score += 40
-        if any("FC" in weather_condition for weather_condition in weather):
-            contributors["funnel_cloud"] = {"score": 100, "value": True, "unit": "boolean"}
-            score = 100
-        if any("FZ" in weather_condition for weather_condition in weather):
+        if "FZ" in wx:
             contributors["freezing_precipitation"] = {"score": 30, "value": True, "unit": "boolean"}
             score += 30
-        if any("+" in weather_condition for weather_condition in weather):
+        if "+" in wx:
             contributors["heavy_precipitation"] = {"score": 20, "value": True, "unit": "boolean"}
             score += 20
     
-    amplification_score, amplification_reasons = correlation_engine.calculate_risk_amplification(contributors)
+    amplification_score, amplification_reasons = RiskCorrelationEngine.calculate_risk_amplification(
+        contributors, wind_score, weather_score, performance_score
+    )
     if amplification_score > 0:
         contributors["risk_amplification"] = {"score": amplification_score, "value": amplification_reasons, "unit": "conditions"}
         score += amplification_score
     
     return round(min(100, score)), contributors
 
-def calculate_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff, metar_data, lat=None, lon=None, rwy_heading=None, notam_data=None):
+# Thresholds read by _advanced_rri_row, unpacked from the config table once per kernel call
+@njit(inline="always")
+def _wind_da_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff,
+                 mult, truncate, contributions):
     """
-    Original RRI calculation function - maintained for backward compatibility
-    For new implementations, use calculate_advanced_rri() for better capabilities
+    _wind_da_contributors for row i of the kernels: (wind_score, da_score), with each score written
+    to its contributions column
     """
-    score = 0
-    contributors = {}
+    wind_score = 0.0
+    da_score = 0.0
     
-    temp_c = metar_data.get("temp_c", 15)
-    
-    if not is_head:
-        tailwind_score = min(30, head * 6)
+    if not is_head[i]:
+        tailwind_score = min(30, head[i] * 6)
         if tailwind_score > 0:
-            contributors["tailwind"] = {"score": tailwind_score, "value": head, "unit": "kt"}
-            score += tailwind_score
-    if cross > 0:
-        crosswind_score = min(30, (cross / 15) * 30)
+            wind_score += tailwind_score
+            contributions[i, ContributorId.TAILWIND] = tailwind_score
+    if cross[i] > 0:
+        crosswind_score = min(30, (cross[i] / (15 * mult)) * 30)
+        if truncate:
+            crosswind_score = int(crosswind_score)
         if crosswind_score > 0:
-            contributors["crosswind"] = {"score": crosswind_score, "value": cross, "unit": "kt"}
-            score += crosswind_score
-        
-    if wind_gust > 0:
-        gust_diff_val = wind_gust - wind_speed
-        gust_diff_score = min(20, (gust_diff_val / 10) * 20)
+            wind_score += crosswind_score
+            contributions[i, ContributorId.CROSSWIND] = crosswind_score
+    
+    if wind_gust[i] > 0:
+        gust_diff_score = min(20, ((wind_gust[i] - wind_speed[i]) / (10 * mult)) * 20)
+        if truncate:
+            gust_diff_score = int(gust_diff_score)
         if gust_diff_score > 0:
-            contributors["gust_differential"] = {"score": gust_diff_score, "value": gust_diff_val, "unit": "kt"}
-            score += gust_diff_score
-        
-        if not gust_is_head:
-            gust_tailwind_score = min(10, (gust_head / 10) * 10)
+            wind_score += gust_diff_score
+            contributions[i, ContributorId.GUST_DIFFERENTIAL] = gust_diff_score
+        if not gust_is_head[i]:
+            gust_tailwind_score = min(10, (gust_head[i] / (10 * mult)) * 10)
+            if truncate:
+                gust_tailwind_score = int(gust_tailwind_score)
             if gust_tailwind_score > 0:
-                contributors["gust_tailwind"] = {"score": gust_tailwind_score, "value": gust_head, "unit": "kt"}
-                score += gust_tailwind_score
-        if gust_cross > 0:
-            gust_crosswind_score = min(10, (gust_cross / 20) * 10)
+                wind_score += gust_tailwind_score
+                contributions[i, ContributorId.GUST_TAILWIND] = gust_tailwind_score
+        if gust_cross[i] > 0:
+            gust_crosswind_score = min(10, (gust_cross[i] / (20 * mult)) * 10)
+            if truncate:
+                gust_crosswind_score = int(gust_crosswind_score)
             if gust_crosswind_score > 0:
-                contributors["gust_crosswind"] = {"score": gust_crosswind_score, "value": gust_cross, "unit": "kt"}
-                score += gust_crosswind_score
-            
-    if da_diff > 0:
-        da_score = min(30, (da_diff / 2000) * 30)
+                wind_score += gust_crosswind_score
+                contributions[i, ContributorId.GUST_CROSSWIND] = gust_crosswind_score
+    
+    if da_diff[i] > 0:
+        da_score = min(30, (da_diff[i] / (2000 * mult)) * 30)
+        if truncate:
+            da_score = int(da_score)
         if da_score > 0:
-            contributors["density_altitude_diff"] = {"score": da_score, "value": da_diff, "unit": "ft"}
-            score += da_score
+            contributions[i, ContributorId.DENSITY_ALTITUDE_DIFF] = da_score
+    
+    return wind_score, da_score
+
+@njit(inline="always")
+def _row_limits(thresholds):
+    return (
+        thresholds[ThresholdIdx.HIGH_THERMAL_TEMP], thresholds[ThresholdIdx.HIGH_THERMAL_SPREAD],
+        thresholds[ThresholdIdx.INVERSION_TEMP], thresholds[ThresholdIdx.INVERSION_SPREAD],
+        thresholds[ThresholdIdx.CONVECTIVE_TEMP], thresholds[ThresholdIdx.CONVECTIVE_SPREAD],
+        thresholds[ThresholdIdx.MECHANICAL_WIND], thresholds[ThresholdIdx.MECHANICAL_SPREAD],
+        thresholds[ThresholdIdx.MARGINAL_RUNWAY], thresholds[ThresholdIdx.CONCERNING_RUNWAY],
+        thresholds[ThresholdIdx.ADEQUATE_RUNWAY], thresholds[ThresholdIdx.HIGH_DA_THRESHOLD],
+        thresholds[ThresholdIdx.MODERATE_DA_THRESHOLD], thresholds[ThresholdIdx.SEVERE_GUST_FACTOR],
+        thresholds[ThresholdIdx.SIGNIFICANT_GUST_FACTOR], thresholds[ThresholdIdx.MODERATE_GUST_FACTOR],
+        thresholds[ThresholdIdx.STRONG_WIND_THRESHOLD], thresholds[ThresholdIdx.FRESH_WIND_THRESHOLD]
+    )
+
+# An airport's row of the airport state array as the weather tuple _advanced_rri_row takes
+@njit(inline="always")
+def _airport_weather(airport_state, a):
+    return (
+        airport_state[a, AirportStateIdx.DEWPOINT_C],
+        airport_state[a, AirportStateIdx.CONTAMINATION_FACTOR],
+        airport_state[a, AirportStateIdx.TERRAIN_FACTOR],
+        airport_state[a, AirportStateIdx.TREND_COLD],
+        airport_state[a, AirportStateIdx.TREND_HOT],
+        airport_state[a, AirportStateIdx.HAS_CLOUDS] != 0,
+        airport_state[a, AirportStateIdx.WX_FREEZING] != 0,
+        airport_state[a, AirportStateIdx.WX_ICE_PELLETS] != 0,
+        airport_state[a, AirportStateIdx.WX_LIGHTNING] != 0,
+        airport_state[a, AirportStateIdx.WX_HAIL] != 0,
+        airport_state[a, AirportStateIdx.WX_HEAVY] != 0,
+        airport_state[a, AirportStateIdx.PRECIP_SCORE],
+        airport_state[a, AirportStateIdx.WIND_SHEAR_SCORE],
+        airport_state[a, AirportStateIdx.ENHANCED_WX_SCORE],
+        airport_state[a, AirportStateIdx.NOTAM_SCORE]
+    )
+
+# Scoring of one batch row, shared by the batch kernels. Inlined into their prange loops before
+# parallelization, so the limits and weather tuples stay loop-invariant values as if they were
+# kernel arguments
+@njit(inline="always")
+def _advanced_rri_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head,
+                      da_diff, temp_c, ceiling, visibility, runway_length, time_points, limits, mult,
+                      thermal_window, inversion_window, weather, contributions):
+    # Mirrors calculate_advanced_rri step for step (including accumulation order) so scores match exactly
+    (high_thermal_temp, high_thermal_spread, inversion_temp, inversion_spread, convective_temp,
+     convective_spread, mechanical_wind, mechanical_spread, marginal_runway, concerning_runway,
+     adequate_runway, high_da_threshold, moderate_da_threshold, severe_gust_factor, significant_gust_factor,
+     moderate_gust_factor, strong_wind_threshold, fresh_wind_threshold) = limits
+    (dewpoint_c, contamination_factor, terrain_factor, trend_cold, trend_hot, has_clouds, wx_freezing,
+     wx_ice_pellets, wx_lightning, wx_hail, wx_heavy, precip_score, wind_shear_score, enhanced_wx_score,
+     notam_score) = weather
+    has_dewpoint = not math.isnan(dewpoint_c)
+    
+    wind_score, da_score = _wind_da_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head,
+                                        gust_is_head, da_diff, mult, True, contributions)
+    score = wind_score + da_score
+    weather_score = 0.0
+    
+    temp = temp_c[i]
+    if has_dewpoint:
+        dewpoint_spread = temp - dewpoint_c
+        
+        thermal_score = 0
+        if temp > high_thermal_temp and dewpoint_spread > high_thermal_spread and thermal_window:
+            thermal_score += int(15 * mult)
+        if temp < inversion_temp and dewpoint_spread < inversion_spread and inversion_window:
+            thermal_score += int(10 * mult)
+        thermal_score = min(int(20 * mult), thermal_score)
+        if thermal_score > 0:
+            score += thermal_score
+            contributions[i, ContributorId.THERMAL_GRADIENT] = thermal_score
         
+        stability_score = 0
+        if temp > convective_temp and dewpoint_spread < convective_spread:
+            convective_risk = min(int(25 * mult), int((30 - temp + (5 - dewpoint_spread)) * 2 * mult))
+            if convective_risk > 0:
+                stability_score += convective_risk
+        if wind_speed[i] > mechanical_wind and dewpoint_spread > mechanical_spread:
+            stability_score += int(10 * mult)
+        stability_score = min(int(30 * mult), stability_score)
+        if stability_score > 0:
+            score += stability_score
+            contributions[i, ContributorId.ATMOSPHERIC_STABILITY] = stability_score
+    
+    perf_score = 0
+    if math.isnan(runway_length[i]):
+        if da_diff[i] > high_da_threshold:
+            perf_score = int(15 * mult)
+        elif da_diff[i] > moderate_da_threshold:
+            perf_score = int(10 * mult)
+        elif da_diff[i] > 500:
+            perf_score = int(5 * mult)
+    else:
+        effective_runway = runway_length[i] / contamination_factor
+        if da_diff[i] > 1000:
+            effective_runway /= 1 + (da_diff[i] / 10000)
+            if da_diff[i] > high_da_threshold:
+                perf_score += int(20 * mult)
+            elif da_diff[i] > moderate_da_threshold:
+                perf_score += int(15 * mult)
+        if effective_runway < marginal_runway:
+            perf_score += int(30 * mult)
+        elif effective_runway < concerning_runway:
+            perf_score += int(20 * mult)
+        elif effective_runway < adequate_runway:
+            perf_score += int(10 * mult)
+        perf_score = min(int(35 * mult), perf_score)
+    if perf_score > 0:
+        score += perf_score
+        contributions[i, ContributorId.RUNWAY_PERFORMANCE] = perf_score
+    
+    if precip_score > 0:
+        score += precip_score
+        contributions[i, ContributorId.PRECIPITATION_INTENSITY] = precip_score
+    
+    turb_score = 0.0
+    if wind_gust[i] > 0:
+        gust_factor = wind_gust[i] / max(wind_speed[i], 1)
+        if gust_factor > severe_gust_factor:
+            turb_score += int(20 * mult)
+        elif gust_factor > significant_gust_factor:
+            turb_score += int(15 * mult)
+        elif gust_factor > moderate_gust_factor:
+            turb_score += int(10 * mult)
+    if wind_speed[i] > strong_wind_threshold:
+        turb_score += int(15 * mult)
+    elif wind_speed[i] > fresh_wind_threshold:
+        turb_score += int(10 * mult)
+    if terrain_factor > 1.0:
+        turb_score += int((terrain_factor - 1.0) * 20 * mult)
+    turb_score = min(int(25 * mult), turb_score)
+    if turb_score > 0:
+        score += turb_score
+        contributions[i, ContributorId.TURBULENCE_RISK] = turb_score
+    
+    trend_score = trend_hot if temp > 25 else trend_cold
+    if trend_score > 0:
+        score += trend_score
+        contributions[i, ContributorId.TREND_ANALYSIS] = trend_score
+    
+    if time_points[i] > 0:
+        score += time_points[i]
+        contributions[i, ContributorId.TIME_OF_DAY] = time_points[i]
+    
+    icing_score = 0
+    if wx_freezing:
+        icing_score += 30
+    if -10 <= temp <= 2 and has_clouds:
+        if 0 <= temp <= 2:
+            icing_score += 25
+        else:
+            icing_score += 20
+    if has_dewpoint and temp - dewpoint_c <= 3 and -5 <= temp <= 5 and has_clouds:
+        icing_score += 15
+    if wx_ice_pellets:
+        icing_score += 20
+    icing_score = min(icing_score, 30)
+    if icing_score > 0:
+        score += icing_score
+        contributions[i, ContributorId.ICING_CONDITIONS] = icing_score
+    
+    temp_perf_score = 0
+    if temp > 35:
+        temp_perf_score += 15
+    elif temp > 30:
+        temp_perf_score += 10
+    if temp < -20:
+        temp_perf_score += 15
+    elif temp < -10:
+        temp_perf_score += 10
+    if temp > 30 and da_diff[i] > 1000:
+        temp_perf_score += 10
+    temp_perf_score = min(temp_perf_score, 25)
+    if temp_perf_score > 0:
+        score += temp_perf_score
+        contributions[i, ContributorId.TEMPERATURE_PERFORMANCE] = temp_perf_score
+    
+    if wind_shear_score > 0:
+        score += wind_shear_score
+        contributions[i, ContributorId.WIND_SHEAR_RISK] = wind_shear_score
+    if enhanced_wx_score > 0:
+        score += enhanced_wx_score
+        contributions[i, ContributorId.ENHANCED_WEATHER] = enhanced_wx_score
+    if notam_score > 0:
+        score += notam_score
+        contributions[i, ContributorId.NOTAM_RISKS] = notam_score
+    
+    if wx_lightning:
+        score += 25
+        weather_score += 25
+        contributions[i, ContributorId.LIGHTNING] = 25
+    
+    ceiling_score = 0
+    if score < 100 and not math.isnan(ceiling[i]):
+        ceiling_score = _step_score_kernel(ceiling[i], CEILING_LIMITS, CEILING_VISIBILITY_SCORES, mult)
+        score += ceiling_score
+        weather_score += ceiling_score
+        contributions[i, ContributorId.LOW_CEILING] = ceiling_score
+    
+    if score < 100 and not math.isnan(visibility[i]):
+        visibility_score = _step_score_kernel(visibility[i], VISIBILITY_LIMITS, CEILING_VISIBILITY_SCORES, mult)
+        score += visibility_score
+        weather_score += visibility_score
+        contributions[i, ContributorId.LOW_VISIBILITY] = visibility_score
+    
+    if score < 100:
+        if wx_hail:
+            score += 40
+            contributions[i, ContributorId.HAIL] = 40
+        if wx_freezing:
+            score += 30
+            contributions[i, ContributorId.FREEZING_PRECIPITATION] = 30
+        if wx_heavy:
+            score += 20
+            contributions[i, ContributorId.HEAVY_PRECIPITATION] = 20
+    
+    weather_score += icing_score
+    performance_score = da_score + temp_perf_score
+    
+    active_domains = int(wind_score > 20) + int(weather_score > 20) + int(performance_score > 15)
+    amplification_score = 0
+    if active_domains >= 2:
+        amplification_score = min(15, active_domains * 5)
+    if icing_score > 0 and ceiling_score > 0:
+        amplification_score += 10
+    if da_score > 20 and wind_score > 15:
+        amplification_score += 10
+    amplification_score = min(amplification_score, 25)
+    if amplification_score > 0:
+        score += amplification_score
+        contributions[i, ContributorId.RISK_AMPLIFICATION] = amplification_score
+    
+    return min(100, score)
+
+@njit(
+    "float64[::1](float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "boolean[::1], boolean[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "float64[::1], Array(float64, 1, 'C', readonly=True), float64, boolean, boolean, "
+    "float64, float64, float64, float64, float64, "
+    "boolean, boolean, boolean, boolean, boolean, boolean, "
+    "float64, float64, float64, float64, float64[:, ::1])",
+    parallel=True, cache=True
+)
+def _advanced_rri_kernel(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head,
+                         da_diff, temp_c, ceiling, visibility, runway_length, time_points, thresholds, mult,
+                         thermal_window, inversion_window, dewpoint_c, contamination_factor, terrain_factor,
+                         trend_cold, trend_hot, has_clouds, wx_freezing, wx_ice_pellets, wx_lightning,
+                         wx_hail, wx_heavy, precip_score, wind_shear_score, enhanced_wx_score, notam_score,
+                         contributions):
+    limits = _row_limits(thresholds)
+    weather = (dewpoint_c, contamination_factor, terrain_factor, trend_cold, trend_hot, has_clouds,
+               wx_freezing, wx_ice_pellets, wx_lightning, wx_hail, wx_heavy, precip_score, wind_shear_score,
+               enhanced_wx_score, notam_score)
+    
+    n = head.shape[0]
+    scores = np.empty(n)
+    for i in prange(n):
+        scores[i] = _advanced_rri_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head,
+                                      gust_is_head, da_diff, temp_c, ceiling, visibility, runway_length,
+                                      time_points, limits, mult, thermal_window, inversion_window, weather,
+                                      contributions)
+    return scores
+
+@njit(
+    "float64[::1](float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "boolean[::1], boolean[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "float64[::1], int64[::1], float64[:, ::1], Array(float64, 1, 'C', readonly=True), float64, "
+    "boolean, boolean, float64[:, ::1])",
+    parallel=True, cache=True
+)
+def _advanced_rri_airports_kernel(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head,
+                                  gust_is_head, da_diff, temp_c, ceiling, visibility, runway_length,
+                                  time_points, airport, airport_state, thresholds, mult, thermal_window,
+                                  inversion_window, contributions):
+    # Row i belongs to airport airport[i]; rows of every airport are spread over the threads together
+    limits = _row_limits(thresholds)
+    
+    n = head.shape[0]
+    scores = np.empty(n)
+    for i in prange(n):
+        weather = _airport_weather(airport_state, airport[i])
+        scores[i] = _advanced_rri_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head,
+                                      gust_is_head, da_diff, temp_c, ceiling, visibility, runway_length,
+                                      time_points, limits, mult, thermal_window, inversion_window, weather,
+                                      contributions)
+    return scores
+
+def _batch_column(values, n, default=None):
+    """Broadcast a scalar or per-scenario sequence to a contiguous float64 column (None -> NaN)."""
+    if values is None:
+        values = default
+    column = np.empty(n)
+    column[:] = np.nan if values is None else np.asarray(values, dtype=np.float64)
+    return column
+
+def _batch_time_points(n, now, lat, lon, rwy_headings):
+    """Time-of-day risk points per scenario, evaluated once per distinct runway heading"""
+    time_points = np.zeros(n)
+    if lat is not None and lon is not None and rwy_headings is not None:
+        headings = _batch_column(rwy_headings, n)
+        for heading in np.unique(headings):
+            points = calculate_time_risk_factor(now, lat, lon, float(heading))["time_risk_points"]
+            time_points[headings == heading] = points
+    return time_points
+
+def _advanced_rri_batch_inputs(now, heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts,
+                               is_heads, gust_is_heads, da_diffs, metar_data, lat=None, lon=None,
+                               rwy_headings=None, notam_data=None, runway_lengths=None, temps_c=None,
+                               ceilings=None, visibilities=None, terrain_factor=1.0, historical_trend=None):
+    """
+    Kernel inputs for the scenarios of one airport: (no_go, columns, state), where no_go holds the
+    contributors that pin every row to 100 (the rest is None then), columns the per-scenario arrays
+    and state the airport's weather/NOTAM inputs in AirportStateIdx order.
+    """
+    n = len(heads)
+    weather = metar_data.get("weather", [])
+    wx = weather_codes(weather)
+    
+    no_go = _no_go_contributors(wx)
+    if no_go:
+        return no_go, None, None
+    
+    dewpoint_c = metar_data.get("dewpoint_c")
+    
+    # Trend risk only depends on the per-scenario temperature through its "> 25°C" check
+    trend_cold = trend_hot = 0
+    if historical_trend:
+        trend_cold, _ = PredictiveRiskModel.calculate_trend_risk({"temp_c": 0}, historical_trend, now.hour)
+        trend_hot, _ = PredictiveRiskModel.calculate_trend_risk({"temp_c": math.inf}, historical_trend, now.hour)
+    
+    notam_is_dict = bool(notam_data) and isinstance(notam_data, dict)
+    contamination = _runway_contamination(wx, _notam_keywords(notam_data.get("raw_text", ""))[0] if notam_is_dict else None)
+    precip_score, _ = WeatherRiskAnalyzer.calculate_precipitation_intensity_risk(weather)
+    wind_shear_score, _ = calculate_wind_shear_risk(metar_data, wx=wx)
+    enhanced_wx_score, _ = parse_enhanced_weather_conditions(metar_data, wx)
+    notam_score, _ = parse_notam_risks(notam_data, None)
+    
+    columns = (
+        _batch_column(heads, n), _batch_column(crosses, n),
+        _batch_column(gust_heads, n), _batch_column(gust_crosses, n),
+        _batch_column(wind_speeds, n), _batch_column(wind_gusts, n),
+        np.array(np.broadcast_to(is_heads, (n,)), dtype=np.bool_),
+        np.array(np.broadcast_to(gust_is_heads, (n,)), dtype=np.bool_),
+        _batch_column(da_diffs, n), _batch_column(temps_c, n, metar_data.get("temp_c", 15)),
+        _batch_column(ceilings, n, metar_data.get("ceiling")),
+        _batch_column(visibilities, n, metar_data.get("visibility")),
+        _batch_column(runway_lengths, n), _batch_time_points(n, now, lat, lon, rwy_headings)
+    )
+    state = (
+        math.nan if dewpoint_c is None else float(dewpoint_c),
+        float(CONTAMINATION_MULTIPLIERS.get(contamination, 1.0)), float(terrain_factor),
+        float(trend_cold), float(trend_hot),
+        has_icing_clouds(metar_data.get("cloud_layers", [])),
+        "FZ" in wx,
+        ("IC" in wx or "PL" in wx),
+        "LTG" in wx,
+        "GR" in wx,
+        "+" in wx,
+        float(precip_score), float(wind_shear_score), float(enhanced_wx_score), float(notam_score)
+    )
+    return no_go, columns, state
+
+def _kernel_config_args(config, now):
+    """Threshold table, multiplier and time-of-day window arguments of the batch kernels"""
+    time_of_day = get_time_of_day(now.hour)
+    return (config.threshold_table, float(config.threshold_multiplier),
+            time_of_day in ["afternoon", "midday"], time_of_day in ["early_morning", "late_evening"])
+
+def _no_go_batch(no_go, n, return_contributors):
+    scores = np.full(n, 100, dtype=np.int64)
+    if return_contributors:
+        contributions = np.zeros((n, len(ContributorId)))
+        for name in no_go:
+            contributions[:, ContributorId[name.upper()]] = 100
+        return scores, contributions
+    return scores
+
+def calculate_advanced_rri_batch(heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts,
+                                 is_heads, gust_is_heads, da_diffs, metar_data, lat=None, lon=None,
+                                 rwy_headings=None, notam_data=None, runway_lengths=None, temps_c=None,
+                                 ceilings=None, visibilities=None, terrain_factor=1.0,
+                                 historical_trend=None, config=None, return_contributors=False, now=None):
+    """
+    Vectorized calculate_advanced_rri over N scenarios sharing one METAR/NOTAM, e.g. every runway
+    at an airport or a set of Monte Carlo draws.
+    
+    Wind, density altitude, runway length and heading inputs are per-scenario arrays (scalars are
+    broadcast); temps_c, ceilings and visibilities override the METAR values per scenario when given.
+    Returns an (N,) int array with the same scores calculate_advanced_rri gives for each row; the
+    string-based weather/NOTAM analysis runs once per batch instead of once per scenario.
+    
+    With return_contributors=True, also returns an (N, K) array of contributor scores with columns
+    indexed by ContributorId (0 where the scalar function would omit the contributor).
+    """
+    if config is None:
+        config = AdvancedRiskConfig()
+    if now is None:
+        now = datetime.utcnow()
+    
+    n = len(heads)
+    no_go, columns, state = _advanced_rri_batch_inputs(
+        now, heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts, is_heads, gust_is_heads,
+        da_diffs, metar_data, lat, lon, rwy_headings, notam_data, runway_lengths, temps_c, ceilings,
+        visibilities, terrain_factor, historical_trend
+    )
+    if no_go:
+        return _no_go_batch(no_go, n, return_contributors)
+    
+    contributions = np.zeros((n, len(ContributorId)))
+    scores = _advanced_rri_kernel(*columns, *_kernel_config_args(config, now), *state, contributions)
+    scores = np.rint(scores).astype(np.int64)
+    if return_contributors:
+        return scores, contributions
+    return scores
+
+def calculate_advanced_rri_airports(airports, config=None, return_contributors=False, now=None):
+    """
+    calculate_advanced_rri_batch for several airports at once, e.g. every runway along a route or
+    on a dashboard: the scenarios of all airports are scored in one parallel kernel call instead of
+    one call per airport.
+    
+    airports is a sequence of dicts of calculate_advanced_rri_batch arguments (heads, crosses, ...,
+    metar_data and any per-airport optional ones), all scored with one config at the same instant.
+    Returns the result calculate_advanced_rri_batch would give for each airport, in order.
+    """
+    if config is None:
+        config = AdvancedRiskConfig()
+    if now is None:
+        now = datetime.utcnow()
+    
+    inputs = [_advanced_rri_batch_inputs(now, **airport) for airport in airports]
+    sizes = [len(airport["heads"]) for airport in airports]
+    scored = [i for i, (no_go, _, _) in enumerate(inputs) if not no_go]
+    
+    if scored:
+        columns = tuple(np.concatenate(column) for column in zip(*(inputs[i][1] for i in scored)))
+        airport = np.repeat(np.arange(len(scored), dtype=np.int64), [sizes[i] for i in scored])
+        airport_state = np.array([inputs[i][2] for i in scored], dtype=np.float64)
+        contributions = np.zeros((len(airport), len(ContributorId)))
+        scores = _advanced_rri_airports_kernel(
+            *columns, airport, airport_state, *_kernel_config_args(config, now), contributions
+        )
+        scores = np.rint(scores).astype(np.int64)
+    
+    results = []
+    offset = 0
+    for (no_go, _, _), n in zip(inputs, sizes):
+        if no_go:
+            results.append(_no_go_batch(no_go, n, return_contributors))
+            continue
+        rows = slice(offset, offset + n)
+        offset += n
+        results.append((scores[rows], contributions[rows]) if return_contributors else scores[rows])
+    return results
+
+def calculate_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff, metar_data, lat=None, lon=None, rwy_heading=None, notam_data=None, now=None):
+    """
+    Original RRI calculation function - maintained for backward compatibility
+    For new implementations, use calculate_advanced_rri() for better capabilities
+    """
+    weather = metar_data.get("weather", [])
+    # One scan of the weather groups serves every weather check below
+    wx = weather_codes(weather)
+    
+    # Nothing else can move a pinned score, so skip the rest of the analysis
+    no_go = _no_go_contributors(wx)
+    if no_go:
+        return 100, no_go
+    
+    wind_score, da_score, contributors = _wind_da_contributors(
+        head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head, da_diff
+    )
+    score = wind_score + da_score
+    
+    temp_c = metar_data.get("temp_c", 15)
+    
     if lat is not None and lon is not None and rwy_heading is not None:
-        time_factors = calculate_time_risk_factor(datetime.utcnow(), lat, lon, rwy_heading)
+        time_factors = calculate_time_risk_factor(now or datetime.utcnow(), lat, lon, rwy_heading)
         if time_factors["time_risk_points"] > 0:
             contributors["time_of_day"] = {"score": time_factors["time_risk_points"], "value": time_factors["time_period"], "unit": "condition"}
             score += time_factors["time_risk_points"]
     
-    icing_score, icing_reasons = calculate_icing_risk(temp_c, metar_data)
+    icing_score, icing_reasons = calculate_icing_risk(temp_c, metar_data, wx)
     if icing_score > 0:
         contributors["icing_conditions"] = {"score": icing_score, "value": icing_reasons, "unit": "conditions"}
         score += icing_score
@@ -759,71 +1618,43 @@ def calculate_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_
         contributors["temperature_performance"] = {"score": temp_perf_score, "value": temp_perf_reasons, "unit": "conditions"}
         score += temp_perf_score
     
-    ws_score, ws_reasons = calculate_wind_shear_risk(metar_data)
+    ws_score, ws_reasons = calculate_wind_shear_risk(metar_data, wx=wx)
     if ws_score > 0:
         contributors["wind_shear_risk"] = {"score": ws_score, "value": ws_reasons, "unit": "conditions"}
         score += ws_score
     
-    enhanced_wx_score, enhanced_wx_reasons = parse_enhanced_weather_conditions(metar_data)
+    enhanced_wx_score, enhanced_wx_reasons = parse_enhanced_weather_conditions(metar_data, wx)
     if enhanced_wx_score > 0:
-        if enhanced_wx_score >= 100:
-            contributors["volcanic_ash"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
-            score = 100
-        else:
-            contributors["enhanced_weather"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
-            score += enhanced_wx_score
+        contributors["enhanced_weather"] = {"score": enhanced_wx_score, "value": enhanced_wx_reasons, "unit": "conditions"}
+        score += enhanced_wx_score
         
-    weather = metar_data.get("weather", [])
     ceiling = metar_data.get("ceiling")
     visibility = metar_data.get("visibility")
     
-    if any("TS" in weather_condition for weather_condition in weather):
-        contributors["thunderstorm"] = {"score": 100, "value": True, "unit": "boolean"}
-        score = 100
-        
-    if any("LTG" in weather_condition for weather_condition in weather):
+    if "LTG" in wx:
         contributors["lightning"] = {"score": 25, "value": True, "unit": "boolean"}
         score += 25
         
     if score < 100 and ceiling is not None:
-        ceiling_score = 0
-        if ceiling < 500:
-            ceiling_score = 40
-        elif ceiling < 1000:
-            ceiling_score = 30
-        elif ceiling < 2000:
-            ceiling_score = 20
-        elif ceiling < 3000:
-            ceiling_score = 10
+        ceiling_score = _step_score(ceiling, CEILING_LIMITS, CEILING_VISIBILITY_SCORES)
         if ceiling_score > 0:
             contributors["low_ceiling"] = {"score": ceiling_score, "value": ceiling, "unit": "ft AGL"}
             score += ceiling_score
             
     if score < 100 and visibility is not None:
-        visibility_score = 0
-        if visibility < 1:
-            visibility_score = 40
-        elif visibility < 2:
-            visibility_score = 30
-        elif visibility < 3:
-            visibility_score = 20
-        elif visibility < 5:
-            visibility_score = 10
+        visibility_score = _step_score(visibility, VISIBILITY_LIMITS, CEILING_VISIBILITY_SCORES)
         if visibility_score > 0:
             contributors["low_visibility"] = {"score": visibility_score, "value": visibility, "unit": "SM"}
             score += visibility_score
             
     if score < 100:
-        if any("GR" in weather_condition for weather_condition in weather):
+        if "GR" in wx:
             contributors["hail"] = {"score": 40, "value": True, "unit": "boolean"}
             score += 40
-        if any("FC" in weather_condition for weather_condition in weather):
-            contributors["funnel_cloud"] = {"score": 100, "value": True, "unit": "boolean"}
-            score = 100
-        if any("FZ" in weather_condition for weather_condition in weather):
+        if "FZ" in wx:
             contributors["freezing_precipitation"] = {"score": 30, "value": True, "unit": "boolean"}
             score += 30
-        if any("+" in weather_condition for weather_condition in weather):
+        if "+" in wx:
             contributors["heavy_precipitation"] = {"score": 20, "value": True, "unit": "boolean"}
             score += 20
         
@@ -834,6 +1665,156 @@ def calculate_rri(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_
     
     return round(min(100, score)), contributors
 
+@njit(
+    "float64[::1](float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "boolean[::1], boolean[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "float64, boolean, boolean, boolean, boolean, boolean, boolean, "
+    "float64, float64, float64, float64[:, ::1])",
+    parallel=True, cache=True
+)
+def _rri_kernel(head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head, gust_is_head,
+                da_diff, temp_c, ceiling, visibility, time_points, dewpoint_c, has_clouds,
+                wx_freezing, wx_ice_pellets, wx_lightning, wx_hail, wx_heavy, wind_shear_score,
+                enhanced_wx_score, notam_score, contributions):
+    # Mirrors calculate_rri step for step (including accumulation order) so scores match exactly
+    has_dewpoint = not math.isnan(dewpoint_c)
+    
+    n = head.shape[0]
+    scores = np.empty(n)
+    for i in prange(n):
+        wind_score, da_score = _wind_da_row(i, head, cross, gust_head, gust_cross, wind_speed, wind_gust, is_head,
+                                            gust_is_head, da_diff, 1.0, False, contributions)
+        score = wind_score + da_score
+        
+        if time_points[i] > 0:
+            score += time_points[i]
+            contributions[i, ContributorId.TIME_OF_DAY] = time_points[i]
+        
+        temp = temp_c[i]
+        icing_score = 0
+        if wx_freezing:
+            icing_score += 30
+        if -10 <= temp <= 2 and has_clouds:
+            if 0 <= temp <= 2:
+                icing_score += 25
+            else:
+                icing_score += 20
+        if has_dewpoint and temp - dewpoint_c <= 3 and -5 <= temp <= 5 and has_clouds:
+            icing_score += 15
+        if wx_ice_pellets:
+            icing_score += 20
+        icing_score = min(icing_score, 30)
+        if icing_score > 0:
+            score += icing_score
+            contributions[i, ContributorId.ICING_CONDITIONS] = icing_score
+        
+        temp_perf_score = 0
+        if temp > 35:
+            temp_perf_score += 15
+        elif temp > 30:
+            temp_perf_score += 10
+        if temp < -20:
+            temp_perf_score += 15
+        elif temp < -10:
+            temp_perf_score += 10
+        if temp > 30 and da_diff[i] > 1000:
+            temp_perf_score += 10
+        temp_perf_score = min(temp_perf_score, 25)
+        if temp_perf_score > 0:
+            score += temp_perf_score
+            contributions[i, ContributorId.TEMPERATURE_PERFORMANCE] = temp_perf_score
+        
+        if wind_shear_score > 0:
+            score += wind_shear_score
+            contributions[i, ContributorId.WIND_SHEAR_RISK] = wind_shear_score
+        if enhanced_wx_score > 0:
+            score += enhanced_wx_score
+            contributions[i, ContributorId.ENHANCED_WEATHER] = enhanced_wx_score
+        
+        if wx_lightning:
+            score += 25
+            contributions[i, ContributorId.LIGHTNING] = 25
+        
+        if score < 100 and not math.isnan(ceiling[i]):
+            ceiling_score = _step_score_kernel(ceiling[i], CEILING_LIMITS, CEILING_VISIBILITY_SCORES, 1.0)
+            score += ceiling_score
+            contributions[i, ContributorId.LOW_CEILING] = ceiling_score
+        
+        if score < 100 and not math.isnan(visibility[i]):
+            visibility_score = _step_score_kernel(visibility[i], VISIBILITY_LIMITS, CEILING_VISIBILITY_SCORES, 1.0)
+            score += visibility_score
+            contributions[i, ContributorId.LOW_VISIBILITY] = visibility_score
+        
+        if score < 100:
+            if wx_hail:
+                score += 40
+                contributions[i, ContributorId.HAIL] = 40
+            if wx_freezing:
+                score += 30
+                contributions[i, ContributorId.FREEZING_PRECIPITATION] = 30
+            if wx_heavy:
+                score += 20
+                contributions[i, ContributorId.HEAVY_PRECIPITATION] = 20
+        
+        if notam_score > 0:
+            score += notam_score
+            contributions[i, ContributorId.NOTAM_RISKS] = notam_score
+        
+        scores[i] = min(100, score)
+    return scores
+
+def calculate_rri_batch(heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts, is_heads,
+                        gust_is_heads, da_diffs, metar_data, lat=None, lon=None, rwy_headings=None,
+                        notam_data=None, temps_c=None, ceilings=None, visibilities=None,
+                        return_contributors=False, now=None):
+    """
+    Vectorized calculate_rri over N scenarios sharing one METAR/NOTAM.
+    
+    Takes the same per-scenario arrays and overrides as calculate_advanced_rri_batch and returns an (N,)
+    int array with the scores calculate_rri gives for each row (plus the (N, K) contributor array
+    when return_contributors=True).
+    """
+    n = len(heads)
+    weather = metar_data.get("weather", [])
+    wx = weather_codes(weather)
+    
+    no_go = _no_go_contributors(wx)
+    if no_go:
+        return _no_go_batch(no_go, n, return_contributors)
+    
+    cloud_layers = metar_data.get("cloud_layers", [])
+    dewpoint_c = metar_data.get("dewpoint_c")
+    
+    wind_shear_score, _ = calculate_wind_shear_risk(metar_data, wx=wx)
+    enhanced_wx_score, _ = parse_enhanced_weather_conditions(metar_data, wx)
+    notam_score, _ = parse_notam_risks(notam_data, None)
+    
+    contributions = np.zeros((n, len(ContributorId)))
+    scores = _rri_kernel(
+        _batch_column(heads, n), _batch_column(crosses, n),
+        _batch_column(gust_heads, n), _batch_column(gust_crosses, n),
+        _batch_column(wind_speeds, n), _batch_column(wind_gusts, n),
+        np.array(np.broadcast_to(is_heads, (n,)), dtype=np.bool_),
+        np.array(np.broadcast_to(gust_is_heads, (n,)), dtype=np.bool_),
+        _batch_column(da_diffs, n), _batch_column(temps_c, n, metar_data.get("temp_c", 15)),
+        _batch_column(ceilings, n, metar_data.get("ceiling")),
+        _batch_column(visibilities, n, metar_data.get("visibility")),
+        _batch_time_points(n, now or datetime.utcnow(), lat, lon, rwy_headings),
+        math.nan if dewpoint_c is None else float(dewpoint_c),
+        has_icing_clouds(cloud_layers),
+        "FZ" in wx,
+        ("IC" in wx or "PL" in wx),
+        "LTG" in wx,
+        "GR" in wx,
+        "+" in wx,
+        float(wind_shear_score), float(enhanced_wx_score), float(notam_score),
+        contributions
+    )
+    scores = np.rint(scores).astype(np.int64)
+    if return_contributors:
+        return scores, contributions
+    return scores
+
 def get_rri_category(rri):
     if rri <= 25:
         return "LOW"
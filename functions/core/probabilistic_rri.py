@@ -16,34 +16,17 @@ Key capabilities:
 Copyright by awade12(openturf.org)
 """
 
-import random
 import math
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from .core_calculations import (
-    calculate_rri, calculate_advanced_rri, wind_components, gust_components,
-    density_alt, get_rri_category, get_status_from_rri
+    calculate_rri, calculate_advanced_rri, wind_and_gust_components, wind_gust_components_batch,
+    calculate_rri_batch, calculate_advanced_rri_batch, density_alt, density_alt_batch,
+    get_rri_category, get_status_from_rri, njit
 )
 
-def convert_numpy_types(obj):
-    """Convert NumPy types to native Python types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(item) for item in obj)
-    else:
-        return obj
-
 @dataclass
 class WeatherPerturbationModel:
     """Realistic weather parameter perturbation constraints"""
@@ -61,6 +44,17 @@ class WeatherPerturbationModel:
         self.temp_bounds = (-4, 4)
         self.pressure_bounds = (-0.05, 0.05)
 
+# Scenario type codes used by the batched Monte Carlo draws (index into this tuple)
+SCENARIO_TYPES = ("normal", "deteriorating", "improving")
+
+# Perturbation bias per scenario type (rows, in SCENARIO_TYPES order) for
+# wind_speed, wind_gust, visibility and ceiling (columns)
+_SCENARIO_BIAS = np.array([
+    [1.0, 1.0, 1.0, 1.0],
+    [1.5, 1.8, 0.7, 0.8],
+    [0.7, 0.6, 1.3, 1.2],
+])
+
 @dataclass
 class ProbabilisticResult:
     """Comprehensive probabilistic analysis results"""
@@ -70,120 +64,173 @@ class ProbabilisticResult:
     extreme_scenarios: List[Dict]
     sensitivity_analysis: Dict[str, float]
     confidence_intervals: Dict[str, Tuple[float, float]]
-    scenario_clusters: Dict[str, List[Dict]]
+    scenario_clusters: Dict[str, Dict[str, Any]]  # per scenario type: "rri" and perturbed-condition columns
     temporal_evolution: Optional[List[Dict]] = None
 
 class AdvancedWeatherPerturber:
     """Sophisticated weather parameter perturbation with realistic correlations"""
     
-    def __init__(self, model: WeatherPerturbationModel):
+    def __init__(self, model: WeatherPerturbationModel, rng: Optional[np.random.Generator] = None):
         self.model = model
+        self.rng = np.random.default_rng(rng)
         
-    def perturb_correlated_weather(self, base_conditions: Dict, scenario_type: str = "normal") -> Dict:
-        """Generate realistic correlated weather perturbations"""
-        perturbed = base_conditions.copy()
-        
-        if scenario_type == "deteriorating":
-            bias_factors = {
-                "wind_speed": 1.5,
-                "wind_gust": 1.8,
-                "visibility": 0.7,
-                "ceiling": 0.8
-            }
-        elif scenario_type == "improving":
-            bias_factors = {
-                "wind_speed": 0.7,
-                "wind_gust": 0.6,
-                "visibility": 1.3,
-                "ceiling": 1.2
-            }
-        else:
-            bias_factors = {key: 1.0 for key in ["wind_speed", "wind_gust", "visibility", "ceiling"]}
-        
-        wind_dir_delta = np.random.normal(0, self.model.wind_dir_std)
-        wind_dir_delta = np.clip(wind_dir_delta, *self.model.wind_dir_bounds)
-        perturbed["wind_dir"] = (base_conditions["wind_dir"] + wind_dir_delta) % 360
-        
-        wind_speed_delta = np.random.normal(0, self.model.wind_speed_std) * bias_factors["wind_speed"]
-        wind_speed_delta = np.clip(wind_speed_delta, *self.model.wind_speed_bounds)
-        perturbed["wind_speed"] = max(0, base_conditions["wind_speed"] + wind_speed_delta)
-        
-        if base_conditions.get("wind_gust", 0) > 0:
-            base_gust_diff = base_conditions["wind_gust"] - base_conditions["wind_speed"]
-            gust_correlation_noise = np.random.normal(0, 1) * (1 - self.model.gust_correlation)
-            gust_delta = wind_speed_delta * self.model.gust_correlation + gust_correlation_noise
-            gust_delta *= bias_factors["wind_gust"]
-            
-            new_gust_diff = max(0, base_gust_diff + gust_delta)
-            perturbed["wind_gust"] = perturbed["wind_speed"] + new_gust_diff
+    @staticmethod
+    def _standard_normals(n: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        (7, n) standard normals for the perturbed parameters, from a scrambled Sobol sequence.
+        Low-discrepancy points cover the tails evenly, so the percentiles settle with fewer draws
+        than independent pseudo-random normals would need.
+        
+        Draws come in antithetic pairs (z, -z) at adjacent positions, so both halves of a pair land
+        in the same scenario bucket; for a near-monotone score this cancels much of the sampling noise.
+        """
+        from scipy.stats import norm, qmc
+        half = (n + 1) // 2
+        points = qmc.Sobol(d=7, scramble=True, seed=rng).random_base2(max(0, math.ceil(math.log2(max(half, 1)))))[:half]
+        z = norm.ppf(points).T
+        return np.stack((z, -z), axis=-1).reshape(7, 2 * half)[:, :n]
+    
+    def perturb_correlated_weather_batch(self, base_conditions: Dict, num_draws: int) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Generate num_draws realistic correlated weather perturbations at once, as (N,) arrays keyed
+        like base_conditions (which is only read, never copied per draw).
+        The first 10% of draws are deteriorating scenarios and the next 10% improving, the rest normal;
+        the returned int8 codes index SCENARIO_TYPES.
+        """
+        n = num_draws
+        deteriorating_end = min(n, math.ceil(n * 0.1))
+        improving_end = min(n, math.ceil(n * 0.2))
+        scenario_codes = np.zeros(n, dtype=np.int8)
+        scenario_codes[:deteriorating_end] = SCENARIO_TYPES.index("deteriorating")
+        scenario_codes[deteriorating_end:improving_end] = SCENARIO_TYPES.index("improving")
+        
+        bias_wind_speed, bias_wind_gust, bias_visibility, bias_ceiling = _SCENARIO_BIAS[scenario_codes].T
+        
+        z_wind_dir, z_wind_speed, z_gust, z_temp, z_pressure, z_visibility, z_ceiling = self._standard_normals(n, self.rng)
+        
+        # The normals are freshly generated and used once, so each parameter is scaled, clipped and
+        # shifted in place in its own row instead of allocating a temporary per step
+        draws = {}
+        wind_dir = z_wind_dir
+        wind_dir *= self.model.wind_dir_std
+        np.clip(wind_dir, *self.model.wind_dir_bounds, out=wind_dir)
+        wind_dir += base_conditions["wind_dir"]
+        draws["wind_dir"] = np.mod(wind_dir, 360, out=wind_dir)
+        
+        wind_speed_delta = z_wind_speed
+        wind_speed_delta *= self.model.wind_speed_std
+        wind_speed_delta *= bias_wind_speed
+        np.clip(wind_speed_delta, *self.model.wind_speed_bounds, out=wind_speed_delta)
+        wind_speed = wind_speed_delta + base_conditions["wind_speed"]
+        draws["wind_speed"] = np.maximum(0, wind_speed, out=wind_speed)
+        
+        base_gust = base_conditions.get("wind_gust", 0)
+        if base_gust > 0:
+            base_gust_diff = base_gust - base_conditions["wind_speed"]
+            gust_delta = z_gust
+            gust_delta *= 1 - self.model.gust_correlation
+            gust_delta += wind_speed_delta * self.model.gust_correlation
+            gust_delta *= bias_wind_gust
+            gust_delta += base_gust_diff
+            np.maximum(0, gust_delta, out=gust_delta)
+            gust_delta += draws["wind_speed"]
+            draws["wind_gust"] = gust_delta
         else:
-            if perturbed["wind_speed"] > 15 and random.random() < 0.3:
-                perturbed["wind_gust"] = perturbed["wind_speed"] + random.uniform(3, 8)
-        
-        temp_delta = np.random.normal(0, self.model.temp_std)
-        temp_delta = np.clip(temp_delta, *self.model.temp_bounds)
-        perturbed["temp_c"] = base_conditions["temp_c"] + temp_delta
+            # Only the draws that pick up a gust need a gust increment
+            gusting = np.flatnonzero((draws["wind_speed"] > 15) & (self.rng.random(n) < 0.3))
+            wind_gust = np.full(n, float(base_gust))
+            wind_gust[gusting] = draws["wind_speed"][gusting] + self.rng.uniform(3, 8, gusting.size)
+            draws["wind_gust"] = wind_gust
+        
+        temp = z_temp
+        temp *= self.model.temp_std
+        np.clip(temp, *self.model.temp_bounds, out=temp)
+        temp += base_conditions["temp_c"]
+        draws["temp_c"] = temp
         
         if "altim_in_hg" in base_conditions:
-            pressure_delta = np.random.normal(0, self.model.pressure_std)
-            pressure_delta = np.clip(pressure_delta, *self.model.pressure_bounds)
-            perturbed["altim_in_hg"] = base_conditions["altim_in_hg"] + pressure_delta
-        
-        if "visibility" in base_conditions and base_conditions["visibility"] is not None:
-            vis_factor = 1 + np.random.normal(0, self.model.visibility_factor) * bias_factors["visibility"]
-            vis_factor = max(0.1, vis_factor)
-            perturbed["visibility"] = max(0.25, base_conditions["visibility"] * vis_factor)
-        
-        if "ceiling" in base_conditions and base_conditions["ceiling"] is not None:
-            ceiling_factor = 1 + np.random.normal(0, self.model.ceiling_factor) * bias_factors["ceiling"]
-            ceiling_factor = max(0.1, ceiling_factor)
-            perturbed["ceiling"] = max(100, base_conditions["ceiling"] * ceiling_factor)
-        
-        return perturbed
+            pressure = z_pressure
+            pressure *= self.model.pressure_std
+            np.clip(pressure, *self.model.pressure_bounds, out=pressure)
+            pressure += base_conditions["altim_in_hg"]
+            draws["altim_in_hg"] = pressure
+        
+        if base_conditions.get("visibility") is not None:
+            visibility = z_visibility
+            visibility *= self.model.visibility_factor
+            visibility *= bias_visibility
+            visibility += 1
+            np.maximum(0.1, visibility, out=visibility)
+            visibility *= base_conditions["visibility"]
+            draws["visibility"] = np.maximum(0.25, visibility, out=visibility)
+        
+        if base_conditions.get("ceiling") is not None:
+            ceiling = z_ceiling
+            ceiling *= self.model.ceiling_factor
+            ceiling *= bias_ceiling
+            ceiling += 1
+            np.maximum(0.1, ceiling, out=ceiling)
+            ceiling *= base_conditions["ceiling"]
+            draws["ceiling"] = np.maximum(100, ceiling, out=ceiling)
+        
+        return draws, scenario_codes
 
 class ScenarioGenerator:
     """Generate diverse weather scenarios for comprehensive analysis"""
+    __slots__ = ()
     
     @staticmethod
-    def generate_temporal_scenarios(base_conditions: Dict, hours_ahead: int = 6) -> List[Dict]:
+    def generate_temporal_scenarios(base_conditions: Dict, hours_ahead: int = 6,
+                                    rng: Optional[np.random.Generator] = None) -> List[Dict]:
         """Generate time-evolved weather scenarios"""
-        scenarios = []
+        rng = np.random.default_rng(rng)
+        hours = np.arange(1, hours_ahead + 1)
+        
+        # Every per-hour draw is made up front as an array and the scenarios are assembled at the end
+        temps = (base_conditions["temp_c"] + 3 * np.sin((hours * np.pi) / 12)).tolist()
+        wind_evolutions = rng.uniform(0.8, 1.3, hours_ahead) ** hours
+        gust_evolutions = rng.uniform(0.7, 1.4, hours_ahead) ** hours
+        adds_mist = (rng.random(hours_ahead) < 0.1 * hours).tolist()
+        confidences = np.maximum(0.3, 1.0 - (hours * 0.15)).tolist()
+        
+        if "wind_speed" in base_conditions:
+            wind_speeds = np.maximum(0, base_conditions["wind_speed"] * wind_evolutions)
+            base_gust = base_conditions.get("wind_gust", 0)
+            if base_gust > 0:
+                wind_gusts = np.maximum(wind_speeds, base_gust * gust_evolutions).tolist()
+            wind_speeds = wind_speeds.tolist()
         
-        for hour in range(1, hours_ahead + 1):
+        scenarios = []
+        for i, hour in enumerate(hours.tolist()):
             scenario = base_conditions.copy()
-            
-            diurnal_temp_change = 3 * math.sin((hour * math.pi) / 12)
-            scenario["temp_c"] += diurnal_temp_change
+            scenario["temp_c"] = temps[i]
             
             if "wind_speed" in scenario:
-                wind_evolution = random.uniform(0.8, 1.3) ** hour
-                scenario["wind_speed"] = max(0, scenario["wind_speed"] * wind_evolution)
-                
-                if scenario.get("wind_gust", 0) > 0:
-                    gust_evolution = random.uniform(0.7, 1.4) ** hour
-                    scenario["wind_gust"] = max(scenario["wind_speed"], 
-                                               scenario["wind_gust"] * gust_evolution)
+                scenario["wind_speed"] = wind_speeds[i]
+                if base_gust > 0:
+                    scenario["wind_gust"] = wind_gusts[i]
             
-            if random.random() < 0.1 * hour:
+            if adds_mist[i]:
                 scenario["weather"] = scenario.get("weather", []) + ["BR"]
             
             scenarios.append({
                 "conditions": scenario,
                 "time_offset": hour,
-                "confidence": max(0.3, 1.0 - (hour * 0.15))
+                "confidence": confidences[i]
             })
         
         return scenarios
     
     @staticmethod
-    def generate_extreme_scenarios(base_conditions: Dict) -> List[Dict]:
+    def generate_extreme_scenarios(base_conditions: Dict, rng: Optional[np.random.Generator] = None) -> List[Dict]:
         """Generate extreme but plausible weather scenarios"""
+        rng = np.random.default_rng(rng)
         scenarios = []
         
         wind_extreme = base_conditions.copy()
         wind_extreme["wind_speed"] = min(50, base_conditions["wind_speed"] * 1.8)
         if wind_extreme["wind_speed"] > 15:
-            wind_extreme["wind_gust"] = wind_extreme["wind_speed"] + random.uniform(8, 15)
+            wind_extreme["wind_gust"] = wind_extreme["wind_speed"] + rng.uniform(8, 15)
         scenarios.append({"type": "wind_extreme", "conditions": wind_extreme, "probability": 0.05})
         
         visibility_extreme = base_conditions.copy()
@@ -193,114 +240,152 @@ class ScenarioGenerator:
         scenarios.append({"type": "visibility_extreme", "conditions": visibility_extreme, "probability": 0.08})
         
         temp_extreme_hot = base_conditions.copy()
-        temp_extreme_hot["temp_c"] += random.uniform(8, 15)
+        temp_extreme_hot["temp_c"] += rng.uniform(8, 15)
         scenarios.append({"type": "temperature_extreme_hot", "conditions": temp_extreme_hot, "probability": 0.03})
         
         temp_extreme_cold = base_conditions.copy()
-        temp_extreme_cold["temp_c"] -= random.uniform(10, 20)
+        temp_extreme_cold["temp_c"] -= rng.uniform(10, 20)
         if temp_extreme_cold["temp_c"] < 2:
             temp_extreme_cold["weather"] = temp_extreme_cold.get("weather", []) + ["FZRA"]
         scenarios.append({"type": "temperature_extreme_cold", "conditions": temp_extreme_cold, "probability": 0.03})
         
         return scenarios
 
+@njit("UniTuple(float64, 6)(float64[::1])", cache=True)
+def _sample_moments(data):
+    """
+    Mean, 2nd-4th central moments, min and max: one pass for the mean and extremes, one fused pass
+    for the central moments
+    """
+    n = data.shape[0]
+    mean = 0.0
+    sample_min = sample_max = data[0]
+    for i in range(n):
+        x = data[i]
+        mean += x
+        if x < sample_min:
+            sample_min = x
+        elif x > sample_max:
+            sample_max = x
+    mean /= n
+    m2 = m3 = m4 = 0.0
+    for i in range(n):
+        d = data[i] - mean
+        d2 = d * d
+        m2 += d2
+        m3 += d2 * d
+        m4 += d2 * d2
+    return mean, m2 / n, m3 / n, m4 / n, sample_min, sample_max
+
 class StatisticalAnalyzer:
     """Advanced statistical analysis of Monte Carlo results"""
+    __slots__ = ()
     
     @staticmethod
-    def calculate_comprehensive_statistics(samples: List[float]) -> Dict[str, float]:
+    def calculate_comprehensive_statistics(samples: np.ndarray) -> Dict[str, float]:
         """Calculate detailed statistical measures"""
-        if not samples:
+        samples_array = np.asarray(samples, dtype=np.float64)
+        if samples_array.size == 0:
             return {}
         
-        samples_array = np.array(samples)
+        n = samples_array.size
+        mean, variance, m3, m4, sample_min, sample_max = _sample_moments(np.ascontiguousarray(samples_array))
+        q25, median, q75 = np.percentile(samples_array, [25, 50, 75])
         
         return {
-            "mean": float(np.mean(samples_array)),
-            "median": float(np.median(samples_array)),
-            "std": float(np.std(samples_array)),
-            "variance": float(np.var(samples_array)),
-            "skewness": float(StatisticalAnalyzer._calculate_skewness(samples_array)),
-            "kurtosis": float(StatisticalAnalyzer._calculate_kurtosis(samples_array)),
-            "min": float(np.min(samples_array)),
-            "max": float(np.max(samples_array)),
-            "range": float(np.max(samples_array) - np.min(samples_array)),
-            "iqr": float(np.percentile(samples_array, 75) - np.percentile(samples_array, 25))
+            "mean": float(mean),
+            "median": float(median),
+            "std": math.sqrt(variance),
+            "variance": float(variance),
+            "skewness": StatisticalAnalyzer._calculate_skewness(n, variance, m3),
+            "kurtosis": StatisticalAnalyzer._calculate_kurtosis(n, variance, m4),
+            "min": float(sample_min),
+            "max": float(sample_max),
+            "range": float(sample_max - sample_min),
+            "iqr": float(q75 - q25)
         }
     
     @staticmethod
-    def _calculate_skewness(data: np.ndarray) -> float:
-        """Calculate skewness of distribution"""
-        if len(data) < 3:
-            return 0.0
-        mean = np.mean(data)
-        std = np.std(data)
-        if std == 0:
+    def _calculate_skewness(n: int, variance: float, m3: float) -> float:
+        """Calculate skewness of distribution from its central moments"""
+        if n < 3 or variance == 0:
             return 0.0
-        return np.mean(((data - mean) / std) ** 3)
+        return m3 / variance ** 1.5
     
     @staticmethod
-    def _calculate_kurtosis(data: np.ndarray) -> float:
-        """Calculate kurtosis of distribution"""
-        if len(data) < 4:
+    def _calculate_kurtosis(n: int, variance: float, m4: float) -> float:
+        """Calculate (excess) kurtosis of distribution from its central moments"""
+        if n < 4 or variance == 0:
             return 0.0
-        mean = np.mean(data)
-        std = np.std(data)
-        if std == 0:
-            return 0.0
-        return np.mean(((data - mean) / std) ** 4) - 3
+        return m4 / variance ** 2 - 3
     
     @staticmethod
-    def calculate_percentiles(samples: List[float], percentiles: List[float] = None) -> Dict[str, float]:
+    def calculate_percentiles(samples: np.ndarray, percentiles: List[float] = None) -> Dict[str, float]:
         """Calculate specified percentiles"""
         if percentiles is None:
             percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
         
-        if not samples:
+        samples_array = np.asarray(samples, dtype=np.float64)
+        if samples_array.size == 0:
             return {f"p{p:02d}": None for p in percentiles}
         
-        samples_array = np.array(samples)
-        return {f"p{p:02d}": float(np.percentile(samples_array, p)) for p in percentiles}
+        values = np.percentile(samples_array, percentiles)
+        return {f"p{p:02d}": float(value) for p, value in zip(percentiles, values)}
     
     @staticmethod
-    def analyze_risk_distribution(samples: List[float]) -> Dict[str, float]:
+    def analyze_risk_distribution(samples: np.ndarray) -> Dict[str, float]:
         """Analyze distribution across risk categories"""
-        if not samples:
+        samples_array = np.asarray(samples, dtype=np.float64)
+        total = samples_array.size
+        if total == 0:
             return {}
         
-        total = len(samples)
+        # Category counts come from one sort: "<= x" counts via side="right", "< x" via side="left"
+        ordered = np.sort(samples_array)
+        at_most_25, at_most_50, at_most_75 = np.searchsorted(ordered, [25, 50, 75], side="right").tolist()
+        below_51, below_76 = np.searchsorted(ordered, [51, 76], side="left").tolist()
+        
         distribution = {
-            "low_risk": sum(1 for s in samples if s <= 25) / total,
-            "moderate_risk": sum(1 for s in samples if 25 < s <= 50) / total,
-            "high_risk": sum(1 for s in samples if 50 < s <= 75) / total,
-            "extreme_risk": sum(1 for s in samples if s > 75) / total
+            "low_risk": at_most_25 / total,
+            "moderate_risk": (at_most_50 - at_most_25) / total,
+            "high_risk": (at_most_75 - at_most_50) / total,
+            "extreme_risk": (total - at_most_75) / total
         }
         
-        distribution["no_go_probability"] = sum(1 for s in samples if s >= 76) / total
-        distribution["caution_probability"] = sum(1 for s in samples if 51 <= s <= 75) / total
-        distribution["good_probability"] = sum(1 for s in samples if s <= 50) / total
+        distribution["no_go_probability"] = (total - below_76) / total
+        distribution["caution_probability"] = (at_most_75 - below_51) / total
+        distribution["good_probability"] = at_most_50 / total
         
         return distribution
 
 class SensitivityAnalyzer:
     """Sensitivity analysis for parameter importance"""
+    __slots__ = ()
     
     @staticmethod
     def calculate_parameter_sensitivity(base_conditions: Dict, rwy_heading: float, 
                                       da_diff: float, metar_data: Dict, 
-                                      lat: float, lon: float) -> Dict[str, float]:
+                                      lat: float, lon: float, now: Optional[datetime] = None) -> Dict[str, float]:
         """Calculate sensitivity of RRI to each parameter"""
-        base_head, base_cross, base_is_head = wind_components(
-            rwy_heading, base_conditions["wind_dir"], base_conditions["wind_speed"]
-        )
-        base_gust_head, base_gust_cross, base_gust_is_head = gust_components(
-            rwy_heading, base_conditions["wind_dir"], base_conditions.get("wind_gust", 0)
+        # Only the wind_dir perturbation changes the wind angle, so the trig for the base direction is
+        # done once and reused for every speed (same arithmetic as wind_components, so same results)
+        rad_diff = math.radians((base_conditions["wind_dir"] - rwy_heading) % 360)
+        base_cos = math.cos(rad_diff)
+        base_sin = math.sin(rad_diff)
+        
+        def components_at_base_dir(speed):
+            head = speed * base_cos
+            return round(abs(head)), round(abs(speed * base_sin)), head >= 0
+        
+        base_head, base_cross, base_is_head = components_at_base_dir(base_conditions["wind_speed"])
+        base_gust_head, base_gust_cross, base_gust_is_head = components_at_base_dir(
+            base_conditions.get("wind_gust", 0)
         )
         
         base_rri, _ = calculate_rri(
             base_head, base_cross, base_gust_head, base_gust_cross,
             base_conditions["wind_speed"], base_conditions.get("wind_gust", 0),
-            base_is_head, base_gust_is_head, da_diff, metar_data, lat, lon, rwy_heading, None
+            base_is_head, base_gust_is_head, da_diff, metar_data, lat, lon, rwy_heading, None, now
         )
         
         sensitivities = {}
@@ -325,19 +410,24 @@ class SensitivityAnalyzer:
                 perturbed_rri, _ = calculate_rri(
                     base_head, base_cross, base_gust_head, base_gust_cross,
                     base_conditions["wind_speed"], base_conditions.get("wind_gust", 0),
-                    base_is_head, base_gust_is_head, da_diff, new_metar, lat, lon, rwy_heading, None
+                    base_is_head, base_gust_is_head, da_diff, new_metar, lat, lon, rwy_heading, None, now
                 )
             else:
                 wind_dir = perturbed_conditions.get("wind_dir", base_conditions["wind_dir"])
                 wind_speed = perturbed_conditions.get("wind_speed", base_conditions["wind_speed"])
                 wind_gust = perturbed_conditions.get("wind_gust", base_conditions.get("wind_gust", 0))
                 
-                head, cross, is_head = wind_components(rwy_heading, wind_dir, wind_speed)
-                gust_head, gust_cross, gust_is_head = gust_components(rwy_heading, wind_dir, wind_gust)
+                if param == "wind_dir":
+                    head, cross, is_head, gust_head, gust_cross, gust_is_head = wind_and_gust_components(
+                        rwy_heading, wind_dir, wind_speed, wind_gust
+                    )
+                else:
+                    head, cross, is_head = components_at_base_dir(wind_speed)
+                    gust_head, gust_cross, gust_is_head = components_at_base_dir(wind_gust)
                 
                 perturbed_rri, _ = calculate_rri(
                     head, cross, gust_head, gust_cross, wind_speed, wind_gust,
-                    is_head, gust_is_head, da_diff, metar_data, lat, lon, rwy_heading, None
+                    is_head, gust_is_head, da_diff, metar_data, lat, lon, rwy_heading, None, now
                 )
             
             sensitivity = abs(perturbed_rri - base_rri) / delta
@@ -345,6 +435,134 @@ class SensitivityAnalyzer:
         
         return sensitivities
 
+def _score_fixed_scenarios(
+    scenario_conditions: List[Dict],
+    rwy_heading: float,
+    da_diff: float,
+    metar_data: Dict,
+    lat: float,
+    lon: float,
+    now: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    calculate_rri for each conditions dict laid over metar_data (what metar_data.copy().update(conditions)
+    would give). Scenarios sharing a weather list go through calculate_rri_batch together; the
+    temperature, ceiling and visibility overrides are per-row columns.
+    """
+    n = len(scenario_conditions)
+    scores = np.empty(n, dtype=np.int64)
+    if n == 0:
+        return scores
+    
+    def overlay(key, default=None):
+        values = [conditions.get(key, metar_data.get(key, default)) for conditions in scenario_conditions]
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    
+    wind_dirs = np.array([conditions["wind_dir"] for conditions in scenario_conditions], dtype=np.float64)
+    wind_speeds = np.array([conditions["wind_speed"] for conditions in scenario_conditions], dtype=np.float64)
+    wind_gusts = np.array([conditions.get("wind_gust", 0) for conditions in scenario_conditions], dtype=np.float64)
+    heads, crosses, is_heads, gust_heads, gust_crosses, gust_is_heads = wind_gust_components_batch(
+        rwy_heading, wind_dirs, wind_speeds, wind_gusts
+    )
+    temps_c = overlay("temp_c", 15)
+    ceilings = overlay("ceiling")
+    visibilities = overlay("visibility")
+    
+    groups = {}
+    for i, conditions in enumerate(scenario_conditions):
+        groups.setdefault(tuple(conditions.get("weather", metar_data.get("weather", []))), []).append(i)
+    
+    for weather, rows in groups.items():
+        rows = np.array(rows)
+        scores[rows] = calculate_rri_batch(
+            heads[rows], crosses[rows], gust_heads[rows], gust_crosses[rows],
+            wind_speeds[rows], wind_gusts[rows], is_heads[rows], gust_is_heads[rows],
+            da_diff, {**metar_data, "weather": list(weather)}, lat, lon, rwy_heading, None,
+            temps_c=temps_c[rows], ceilings=ceilings[rows], visibilities=visibilities[rows], now=now
+        )
+    return scores
+
+def _monte_carlo_samples(
+    rwy_heading: float,
+    base_conditions: Dict,
+    da_diff: float,
+    metar_data: Dict,
+    lat: float,
+    lon: float,
+    num_draws: int,
+    include_extremes: bool,
+    include_temporal: bool,
+    runway_length: Optional[int],
+    airport_elevation: Optional[int],
+    seed: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[float], Optional[List[Dict]]]:
+    """
+    Perturb and score num_draws scenarios, plus the extreme and temporal scenarios if requested.
+    Returns the draw columns, their scenario codes and scores, the list of all sampled RRIs
+    (draws and extremes) and the temporal evolution (None unless include_temporal).
+    All random draws come from one generator seeded with seed (fresh entropy when None).
+    """
+    rng = np.random.default_rng(seed)
+    
+    # All draws are perturbed and scored as arrays, without contributor breakdowns
+    weather_perturber = AdvancedWeatherPerturber(WeatherPerturbationModel(), rng)
+    draws, scenario_codes = weather_perturber.perturb_correlated_weather_batch(base_conditions, num_draws)
+    wind_dirs = draws["wind_dir"]
+    wind_speeds = draws["wind_speed"]
+    wind_gusts = draws["wind_gust"]
+    
+    heads, crosses, is_heads, gust_heads, gust_crosses, gust_is_heads = wind_gust_components_batch(
+        rwy_heading, wind_dirs, wind_speeds, wind_gusts
+    )
+    
+    if "altim_in_hg" in draws and airport_elevation:
+        da_diffs = density_alt_batch(airport_elevation, draws["temp_c"], draws["altim_in_hg"]) - airport_elevation
+    else:
+        da_diffs = da_diff
+    
+    # A visibility/ceiling key with no value overrides the METAR value with "not reported"
+    visibilities = draws.get("visibility", np.nan if "visibility" in base_conditions else None)
+    ceilings = draws.get("ceiling", np.nan if "ceiling" in base_conditions else None)
+    
+    if runway_length and airport_elevation:
+        draw_scores = calculate_advanced_rri_batch(
+            heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts,
+            is_heads, gust_is_heads, da_diffs, metar_data, lat, lon, rwy_heading, None,
+            runway_length, temps_c=draws["temp_c"], ceilings=ceilings, visibilities=visibilities, now=now
+        )
+    else:
+        draw_scores = calculate_rri_batch(
+            heads, crosses, gust_heads, gust_crosses, wind_speeds, wind_gusts,
+            is_heads, gust_is_heads, da_diffs, metar_data, lat, lon, rwy_heading, None,
+            temps_c=draws["temp_c"], ceilings=ceilings, visibilities=visibilities, now=now
+        )
+    
+    rri_samples = draw_scores.tolist()
+    
+    # Extreme and temporal scenarios are scored together in one batched pass
+    extreme_scenarios = ScenarioGenerator.generate_extreme_scenarios(base_conditions, rng) if include_extremes else []
+    temporal_scenarios = ScenarioGenerator.generate_temporal_scenarios(base_conditions, rng=rng) if include_temporal else []
+    fixed_scores = _score_fixed_scenarios(
+        [scenario["conditions"] for scenario in extreme_scenarios + temporal_scenarios],
+        rwy_heading, da_diff, metar_data, lat, lon, now
+    ).tolist()
+    rri_samples.extend(fixed_scores[:len(extreme_scenarios)])
+    
+    temporal_evolution = None
+    if include_temporal:
+        temporal_evolution = [
+            {
+                "time_offset": temporal["time_offset"],
+                "rri": temporal_rri,
+                "confidence": temporal["confidence"],
+                "conditions": temporal["conditions"]
+            }
+            for temporal, temporal_rri in zip(temporal_scenarios, fixed_scores[len(extreme_scenarios):])
+        ]
+    
+    return draws, scenario_codes, draw_scores, rri_samples, temporal_evolution
+
 def calculate_advanced_probabilistic_rri(
     rwy_heading: float,
     base_conditions: Dict,
@@ -357,32 +575,20 @@ def calculate_advanced_probabilistic_rri(
     include_extremes: bool = True,
     runway_length: Optional[int] = None,
     airport_elevation: Optional[int] = None,
-    aircraft_category: str = "light"
+    aircraft_category: str = "light",
+    seed: Optional[int] = None,
+    now: Optional[datetime] = None
 ) -> ProbabilisticResult:
     """
     Advanced probabilistic RRI calculation with comprehensive uncertainty analysis
+    Pass seed to make the sampled scenarios (and so the result) reproducible.
+    Every scenario is scored at the same instant, now (UTC; the current time when None).
     """
+    if now is None:
+        now = datetime.utcnow()
     
-    perturbation_model = WeatherPerturbationModel()
-    weather_perturber = AdvancedWeatherPerturber(perturbation_model)
-    scenario_generator = ScenarioGenerator()
-    statistical_analyzer = StatisticalAnalyzer()
-    sensitivity_analyzer = SensitivityAnalyzer()
-    
-    rri_samples = []
-    scenario_details = []
-    
-    for i in range(num_draws):
-        scenario_type = "normal"
-        if i < num_draws * 0.1:
-            scenario_type = "deteriorating"
-        elif i < num_draws * 0.2:
-            scenario_type = "improving"
-        
-        perturbed_conditions = weather_perturber.perturb_correlated_weather(
-            base_conditions, scenario_type
-        )
-        
+    def evaluate_scenario(perturbed_conditions: Dict) -> Tuple[int, Dict]:
+        """Score a single perturbed scenario with its full contributor breakdown"""
         perturbed_metar = metar_data.copy()
         perturbed_metar["temp_c"] = perturbed_conditions["temp_c"]
         if "visibility" in perturbed_conditions:
@@ -399,103 +605,54 @@ def calculate_advanced_probabilistic_rri(
         else:
             new_da_diff = da_diff
         
-        head, cross, is_head = wind_components(
-            rwy_heading, perturbed_conditions["wind_dir"], perturbed_conditions["wind_speed"]
+        head, cross, is_head, gust_head, gust_cross, gust_is_head = wind_and_gust_components(
+            rwy_heading, perturbed_conditions["wind_dir"], perturbed_conditions["wind_speed"],
+            perturbed_conditions.get("wind_gust", 0)
         )
         
-        gust_head, gust_cross, gust_is_head = (0, 0, True)
-        if perturbed_conditions.get("wind_gust", 0) > 0:
-            gust_head, gust_cross, gust_is_head = gust_components(
-                rwy_heading, perturbed_conditions["wind_dir"], perturbed_conditions["wind_gust"]
-            )
-        
         if runway_length and airport_elevation:
-            rri_score, contributors = calculate_advanced_rri(
+            return calculate_advanced_rri(
                 head, cross, gust_head, gust_cross,
                 perturbed_conditions["wind_speed"], perturbed_conditions.get("wind_gust", 0),
                 is_head, gust_is_head, new_da_diff, perturbed_metar,
                 lat, lon, rwy_heading, None, runway_length, airport_elevation,
-                1.0, None, aircraft_category
-            )
-        else:
-            rri_score, contributors = calculate_rri(
-                head, cross, gust_head, gust_cross,
-                perturbed_conditions["wind_speed"], perturbed_conditions.get("wind_gust", 0),
-                is_head, gust_is_head, new_da_diff, perturbed_metar,
-                lat, lon, rwy_heading, None
-            )
-        
-        rri_samples.append(rri_score)
-        scenario_details.append({
-            "rri": rri_score,
-            "conditions": perturbed_conditions,
-            "scenario_type": scenario_type,
-            "contributors": contributors
-        })
-    
-    if include_extremes:
-        extreme_scenarios = scenario_generator.generate_extreme_scenarios(base_conditions)
-        for extreme in extreme_scenarios:
-            extreme_metar = metar_data.copy()
-            extreme_metar.update(extreme["conditions"])
-            
-            head, cross, is_head = wind_components(
-                rwy_heading, extreme["conditions"]["wind_dir"], extreme["conditions"]["wind_speed"]
-            )
-            gust_head, gust_cross, gust_is_head = gust_components(
-                rwy_heading, extreme["conditions"]["wind_dir"], extreme["conditions"].get("wind_gust", 0)
-            )
-            
-            extreme_rri, _ = calculate_rri(
-                head, cross, gust_head, gust_cross,
-                extreme["conditions"]["wind_speed"], extreme["conditions"].get("wind_gust", 0),
-                is_head, gust_is_head, da_diff, extreme_metar,
-                lat, lon, rwy_heading, None
+                1.0, None, aircraft_category, now=now
             )
-            
-            rri_samples.append(extreme_rri)
+        return calculate_rri(
+            head, cross, gust_head, gust_cross,
+            perturbed_conditions["wind_speed"], perturbed_conditions.get("wind_gust", 0),
+            is_head, gust_is_head, new_da_diff, perturbed_metar,
+            lat, lon, rwy_heading, None, now
+        )
     
-    temporal_evolution = None
-    if include_temporal:
-        temporal_scenarios = scenario_generator.generate_temporal_scenarios(base_conditions)
-        temporal_evolution = []
-        
-        for temporal in temporal_scenarios:
-            temp_metar = metar_data.copy()
-            temp_metar.update(temporal["conditions"])
-            
-            head, cross, is_head = wind_components(
-                rwy_heading, temporal["conditions"]["wind_dir"], temporal["conditions"]["wind_speed"]
-            )
-            gust_head, gust_cross, gust_is_head = gust_components(
-                rwy_heading, temporal["conditions"]["wind_dir"], temporal["conditions"].get("wind_gust", 0)
-            )
-            
-            temporal_rri, _ = calculate_rri(
-                head, cross, gust_head, gust_cross,
-                temporal["conditions"]["wind_speed"], temporal["conditions"].get("wind_gust", 0),
-                is_head, gust_is_head, da_diff, temp_metar,
-                lat, lon, rwy_heading, None
-            )
-            
-            temporal_evolution.append({
-                "time_offset": temporal["time_offset"],
-                "rri": temporal_rri,
-                "confidence": temporal["confidence"],
-                "conditions": temporal["conditions"]
-            })
+    # Contributor breakdowns are only worked out (with evaluate_scenario) for the handful of
+    # extreme scenarios that are reported
+    draws, scenario_codes, draw_scores, rri_samples, temporal_evolution = _monte_carlo_samples(
+        rwy_heading, base_conditions, da_diff, metar_data, lat, lon, num_draws,
+        include_extremes, include_temporal, runway_length, airport_elevation, seed, now
+    )
+    
+    def scenario_detail(i: int) -> Dict:
+        """Build the reported dict for draw i from the draw arrays"""
+        conditions = {**base_conditions, **{key: float(values[i]) for key, values in draws.items()}}
+        return {
+            "rri": rri_samples[i],
+            "conditions": conditions,
+            "scenario_type": SCENARIO_TYPES[scenario_codes[i]],
+            "contributors": evaluate_scenario(conditions)[1]
+        }
     
-    percentiles = statistical_analyzer.calculate_percentiles(rri_samples)
-    statistics = statistical_analyzer.calculate_comprehensive_statistics(rri_samples)
-    risk_distribution = statistical_analyzer.analyze_risk_distribution(rri_samples)
+    samples = np.array(rri_samples, dtype=np.float64)
+    percentiles = StatisticalAnalyzer.calculate_percentiles(samples)
+    statistics = StatisticalAnalyzer.calculate_comprehensive_statistics(samples)
+    risk_distribution = StatisticalAnalyzer.analyze_risk_distribution(samples)
     
     extreme_scenarios_analysis = [
-        scenario for scenario in scenario_details 
-        if scenario["rri"] >= float(np.percentile(rri_samples, 95))
-    ][:10]
+        scenario_detail(i) for i in np.flatnonzero(draw_scores >= percentiles["p95"])[:10]
+    ]
     
-    sensitivity_analysis = sensitivity_analyzer.calculate_parameter_sensitivity(
-        base_conditions, rwy_heading, da_diff, metar_data, lat, lon
+    sensitivity_analysis = SensitivityAnalyzer.calculate_parameter_sensitivity(
+        base_conditions, rwy_heading, da_diff, metar_data, lat, lon, now
     )
     
     confidence_intervals = {
@@ -504,21 +661,26 @@ def calculate_advanced_probabilistic_rri(
         "50_percent": (percentiles["p25"], percentiles["p75"])
     }
     
-    scenario_clusters = {
-        "normal": [s for s in scenario_details if s["scenario_type"] == "normal"],
-        "deteriorating": [s for s in scenario_details if s["scenario_type"] == "deteriorating"],
-        "improving": [s for s in scenario_details if s["scenario_type"] == "improving"]
-    }
+    scenario_clusters = {}
+    for code, scenario_type in enumerate(SCENARIO_TYPES):
+        in_cluster = scenario_codes == code
+        scenario_clusters[scenario_type] = {
+            "rri": draw_scores[in_cluster],
+            **{key: values[in_cluster] for key, values in draws.items()}
+        }
     
+    # Everything except the cluster columns is already built from native Python values, so the
+    # result drops straight into a JSON response; the cluster arrays are for in-process use
+    # (orjson's OPT_SERIALIZE_NUMPY handles them if they ever need to be serialized)
     result = ProbabilisticResult(
-        percentiles=convert_numpy_types(percentiles),
-        statistics=convert_numpy_types(statistics),
-        risk_distribution=convert_numpy_types(risk_distribution),
-        extreme_scenarios=convert_numpy_types(extreme_scenarios_analysis),
-        sensitivity_analysis=convert_numpy_types(sensitivity_analysis),
-        confidence_intervals=convert_numpy_types(confidence_intervals),
-        scenario_clusters=convert_numpy_types(scenario_clusters),
-        temporal_evolution=convert_numpy_types(temporal_evolution)
+        percentiles=percentiles,
+        statistics=statistics,
+        risk_distribution=risk_distribution,
+        extreme_scenarios=extreme_scenarios_analysis,
+        sensitivity_analysis=sensitivity_analysis,
+        confidence_intervals=confidence_intervals,
+        scenario_clusters=scenario_clusters,
+        temporal_evolution=temporal_evolution
     )
     
     return result
@@ -546,11 +708,30 @@ def calculate_probabilistic_rri_monte_carlo(
         "temp_c": metar_data.get("temp_c", 15)
     }
     
-    result = calculate_advanced_probabilistic_rri(
-        rwy_heading, base_conditions, da_diff, metar_data, lat, lon, num_draws
+    # Only the 5th/95th percentiles are reported, so the statistics, sensitivity and
+    # scenario breakdowns of the full analysis are skipped
+    _, _, _, rri_samples, _ = _monte_carlo_samples(
+        rwy_heading, base_conditions, da_diff, metar_data, lat, lon, num_draws,
+        True, False, None, None
     )
     
+    percentiles = StatisticalAnalyzer.calculate_percentiles(rri_samples, [5, 95])
+    
     return {
-        "rri_p05": convert_numpy_types(result.percentiles["p05"]),
-        "rri_p95": convert_numpy_types(result.percentiles["p95"])
-    } 
\ No newline at end of file
+        "rri_p05": percentiles["p05"],
+        "rri_p95": percentiles["p95"]
+    }
+
+
+def warm_up() -> None:
+    """
+    Run a tiny analysis through both scoring paths so the lazily imported sampling dependencies
+    (scipy.stats) and the cached numba kernels are loaded before the first request needs them.
+    """
+    base_conditions = {"wind_dir": 0, "wind_speed": 10, "wind_gust": 0, "temp_c": 15, "altim_in_hg": 29.92}
+    metar_data = {"temp_c": 15, "weather": [], "cloud_layers": []}
+    for runway_length, airport_elevation in ((None, None), (5000, 1000)):
+        calculate_advanced_probabilistic_rri(
+            0, base_conditions, 0, metar_data, None, None, num_draws=8, include_temporal=True,
+            runway_length=runway_length, airport_elevation=airport_elevation, seed=0
+        )
@@ -23,9 +23,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from ..data_sources.weather_fetcher import fetch_metar, fetch_taf, fetch_notams, fetch_stationinfo
+from ..data_sources.weather_fetcher import fetch_metars, fetch_tafs, fetch_notams, fetch_stationinfo
 from ..data_sources.getairportinfo import fetch_airport_info
-from .core_calculations import calculate_advanced_rri, wind_components, density_alt, get_rri_category, get_status_from_rri
+from .core_calculations import calculate_advanced_rri_airports, runway_wind_components_batch, density_alt, get_rri_category, get_status_from_rri, weather_codes
 from ..config.advanced_config import ConfigurationManager
 
 logger = logging.getLogger(__name__)
@@ -104,7 +104,7 @@ class RouteAnalyzer:
                 "aircraft_config": {
                     "type": self.aircraft_type,
                     "experience_level": self.pilot_experience,
-                    "risk_profile": self.config.risk_profile.value
+                    "risk_profile": self.config.risk_profile.label
                 }
             },
             "waypoints": [self._serialize_waypoint(wp) for wp in waypoints],
@@ -120,22 +120,30 @@ class RouteAnalyzer:
         """Fetch all necessary data for route waypoints"""
         waypoints = []
         
+        # METARs and TAFs for the whole route come back from one request each
+        metars, tafs = await asyncio.gather(fetch_metars(airports), fetch_tafs(airports), return_exceptions=True)
+        
         tasks = []
         for icao in airports:
-            tasks.append(self._fetch_single_waypoint_data(icao))
+            metar = metars if isinstance(metars, Exception) else metars[icao]
+            taf = tafs if isinstance(tafs, Exception) else tafs[icao]
+            tasks.append(self._fetch_single_waypoint_data(icao, metar, taf))
         
         waypoint_data = await asyncio.gather(*tasks, return_exceptions=True)
         
+        fetched = []
         for i, (icao, data) in enumerate(zip(airports, waypoint_data)):
             if isinstance(data, Exception):
                 logger.error(f"Failed to fetch data for {icao}: {data}")
                 continue
-            
+            fetched.append((i, icao, data))
+        
+        runway_analyses = self._analyze_best_runways([(data["airport_info"], data["metar"]) for _, _, data in fetched])
+        
+        for (i, icao, data), best_runway in zip(fetched, runway_analyses):
             position = "departure" if i == 0 else "destination" if i == len(airports) - 1 else "en_route"
             distance = distances[i] if distances and i < len(distances) else None
             
-            best_runway = self._analyze_best_runway(data["airport_info"], data["metar"])
-            
             waypoint = RouteWaypoint(
                 icao=icao,
                 airport_info=data["airport_info"],
@@ -155,13 +163,14 @@ class RouteAnalyzer:
         
         return waypoints
     
-    async def _fetch_single_waypoint_data(self, icao: str) -> Dict[str, Any]:
-        """Fetch all data for a single waypoint"""
+    async def _fetch_single_waypoint_data(self, icao: str, metar: Dict[str, Any], taf: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the remaining data for a single waypoint whose METAR and TAF were fetched with the route"""
         try:
-            airport_info, metar, taf, notams, station_info = await asyncio.gather(
+            for fetched in (metar, taf):
+                if isinstance(fetched, Exception):
+                    raise fetched
+            airport_info, notams, station_info = await asyncio.gather(
                 fetch_airport_info(icao),
-                fetch_metar(icao),
-                fetch_taf(icao),
                 fetch_notams(icao),
                 fetch_stationinfo(icao)
             )
@@ -177,61 +186,76 @@ class RouteAnalyzer:
             logger.error(f"Error fetching data for {icao}: {e}")
             raise
     
-    def _analyze_best_runway(self, airport_info: Dict, metar: Dict) -> Dict[str, Any]:
-        """Analyze the best runway option for current conditions"""
-        runways = airport_info.get("runways", [])
-        if not runways:
-            return {"error": "No runway data available"}
-        
-        field_elev = airport_info.get("elevation", 0)
-        wind_dir = metar.get("wind_dir", 0)
-        wind_speed = metar.get("wind_speed", 0)
-        wind_gust = metar.get("wind_gust", 0)
-        temp_c = metar.get("temp_c", 15)
-        altim_in_hg = metar.get("altim_in_hg", 29.92)
-        
-        runway_analyses = []
-        
-        for runway in runways:
-            rwy_heading = runway.get("heading")
-            if rwy_heading is None:
+    def _analyze_best_runways(self, airports: List[Tuple[Dict, Dict]]) -> List[Dict[str, Any]]:
+        """Analyze the best runway option for current conditions at each (airport_info, metar) pair"""
+        prepared = []
+        for airport_info, metar in airports:
+            runways = airport_info.get("runways", [])
+            if not runways:
+                prepared.append({"error": "No runway data available"})
                 continue
             
-            head, cross, is_head = wind_components(rwy_heading, wind_dir, wind_speed)
+            field_elev = airport_info.get("elevation", 0)
+            wind_dir = metar.get("wind_dir", 0)
+            wind_speed = metar.get("wind_speed", 0)
+            wind_gust = metar.get("wind_gust", 0)
+            temp_c = metar.get("temp_c", 15)
+            altim_in_hg = metar.get("altim_in_hg", 29.92)
+            
             da = density_alt(field_elev, temp_c, altim_in_hg)
             da_diff = da - field_elev
             
-            rri, contributors = calculate_advanced_rri(
-                head=head, cross=cross, gust_head=0, gust_cross=0,
-                wind_speed=wind_speed, wind_gust=wind_gust,
-                is_head=is_head, gust_is_head=True, da_diff=da_diff,
-                metar_data=metar, runway_length=runway.get("length"),
-                aircraft_category=self.aircraft_type
+            valid_runways = [runway for runway in runways if runway.get("heading") is not None]
+            heads, crosses, is_heads = runway_wind_components_batch(
+                [runway["heading"] for runway in valid_runways], wind_dir, wind_speed
             )
+            prepared.append((valid_runways, heads, crosses, is_heads, da, da_diff, {
+                "heads": heads, "crosses": crosses, "gust_heads": 0, "gust_crosses": 0,
+                "wind_speeds": wind_speed, "wind_gusts": wind_gust, "is_heads": is_heads, "gust_is_heads": True,
+                "da_diffs": da_diff, "metar_data": metar,
+                "runway_lengths": [runway.get("length") for runway in valid_runways]
+            }))
+        
+        # Every runway of every airport is scored in one batched call
+        batches = [entry[-1] for entry in prepared if isinstance(entry, tuple) and entry[0]]
+        airport_rris = iter(calculate_advanced_rri_airports(batches) if batches else [])
+        
+        results = []
+        for entry in prepared:
+            if not isinstance(entry, tuple):
+                results.append(entry)
+                continue
+            valid_runways, heads, crosses, is_heads, da, da_diff, _ = entry
+            runway_rris = next(airport_rris).tolist() if valid_runways else []
             
-            runway_analyses.append({
-                "runway_id": runway.get("id"),
-                "heading": rwy_heading,
-                "length": runway.get("length"),
-                "headwind_kt": head,
-                "crosswind_kt": cross,
-                "tailwind": not is_head,
-                "rri": rri,
-                "risk_category": get_rri_category(rri),
-                "status": get_status_from_rri(rri)
+            runway_analyses = []
+            for runway, head, cross, is_head, rri in zip(valid_runways, heads.tolist(), crosses.tolist(),
+                                                         is_heads.tolist(), runway_rris):
+                runway_analyses.append({
+                    "runway_id": runway.get("id"),
+                    "heading": runway["heading"],
+                    "length": runway.get("length"),
+                    "headwind_kt": head,
+                    "crosswind_kt": cross,
+                    "tailwind": not is_head,
+                    "rri": rri,
+                    "risk_category": get_rri_category(rri),
+                    "status": get_status_from_rri(rri)
+                })
+            
+            if not runway_analyses:
+                results.append({"error": "No valid runway data available for analysis"})
+                continue
+            
+            best_runway = min(runway_analyses, key=lambda x: x["rri"])
+            
+            results.append({
+                "best_runway": best_runway,
+                "all_runways": runway_analyses,
+                "density_altitude": da,
+                "density_altitude_diff": da_diff
             })
-        
-        if not runway_analyses:
-            return {"error": "No valid runway data available for analysis"}
-        
-        best_runway = min(runway_analyses, key=lambda x: x["rri"])
-        
-        return {
-            "best_runway": best_runway,
-            "all_runways": runway_analyses,
-            "density_altitude": da,
-            "density_altitude_diff": da_diff
-        }
+        return results
     
     def _assess_overall_route(self, waypoints: List[RouteWaypoint]) -> Dict[str, Any]:
         """Assess overall route conditions and risks"""
@@ -390,7 +414,7 @@ class RouteAnalyzer:
             visibility = metar.get("visibility")
             temp_c = metar.get("temp_c", 15)
             
-            if any("TS" in w for w in weather):
+            if "TS" in weather_codes(weather):
                 thunderstorm_airports.append(wp.icao)
             
             if -10 <= temp_c <= 2 and metar.get("cloud_layers"):
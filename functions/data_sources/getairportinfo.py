@@ -1,5 +1,6 @@
 from functions.infrastructure.caching import cached_fetch
 import os
+import orjson
 from dotenv import load_dotenv
 
 
@@ -13,7 +14,7 @@ async def fetch_airport_info(icao):
         print(f"[airport_info] Response headers: {r.headers}")
         print(f"[airport_info] Response type: {type(r.text)}")
         if r.headers.get("content-type", "").startswith("application/json"):
-            data = r.json()
+            data = orjson.loads(r.content)
             print(f"[airport_info] JSON data: {data}")
             elev = data.get("elevation") or None
             mag_dec = data.get("mag_dec") or None
@@ -14,157 +14,199 @@ when APIs are down or return weird data.
 """
 
 import os
+import re
 import logging
-from typing import Dict, Any, Optional
-from functions.infrastructure.caching import cached_fetch
+import orjson
+from typing import Dict, Any, List, Optional
+from functions.infrastructure.caching import cached_fetch, cached_fetch_batch
 
 logger = logging.getLogger(__name__)
 
 API_BASE = os.getenv("FAA_API")
 
+# METAR groups, matched against whole tokens
+_OBS_TIME_RE = re.compile(r"\d{6}Z")
+_WIND_RE = re.compile(r"(\d{3})(\d{2,3})(?:G(\d{2,3}))?KT")
+_TEMP_DEW_RE = re.compile(r"(M?)(\d{2})/(M?)(\d{2})")
+_VISIBILITY_RE = re.compile(r"(\d+(?:\.\d+)?)(?:/(\d+))?SM")
+_CLOUD_RE = re.compile(r"(SKC|CLR|FEW|SCT|BKN|OVC)(\d+)")
+_ALTIMETER_RE = re.compile(r"A(\d{4})")
+# Tokens containing any of these are kept as weather phenomena
+_WEATHER_RE = re.compile(r"TS|GR|\+|FC|SH|FZ|BR|FG|RA")
 
-async def fetch_metar(icao: str) -> Dict[str, Any]:
-    """Fetch and parse METAR data for an airport."""
-    url = f"{API_BASE}/metar?ids={icao}&format=raw"
-    def parser(r):
-        logger.debug(f"[metar] Response headers: {r.headers}")
-        logger.debug(f"[metar] Response type: {type(r.text)}")
-        logger.debug(f"[metar] Raw response: {r.text[:500]}")
-        
-        metar_text = r.text.strip()
-        if not metar_text:
-            return {"obs_time": None, "wind_dir": 0, "wind_speed": 0, "altim_in_hg": 29.92, "temp_c": 15, "raw": None, "debug": "No METAR data returned"}
-            
-        data = {
-            "obs_time": None, 
-            "wind_dir": 0, 
-            "wind_speed": 0, 
-            "wind_gust": 0, 
-            "altim_in_hg": 29.92, 
-            "temp_c": 15, 
-            "dewpoint_c": None,
-            "ceiling": None,
-            "cloud_layers": [],
-            "visibility": None,
-            "weather": set(),
-            "lightning": None,
-            "raw": metar_text, 
-            "debug": None
-        }
-        
-        temp_c_found = False
 
-        parts = metar_text.split()
-        for i, part in enumerate(parts):
-            if part.endswith("Z") and len(part) == 7:
-                data["obs_time"] = part
+def _obs_time(match, data):
+    data["obs_time"] = match.group(0)
+
+def _wind(match, data):
+    wind_dir, wind_speed, wind_gust = match.groups()
+    data["wind_dir"] = int(wind_dir)
+    data["wind_speed"] = int(wind_speed)
+    if wind_gust:
+        data["wind_gust"] = int(wind_gust)
+
+def _visibility(match, data):
+    num, den = match.groups()
+    data["visibility"] = float(num) / float(den) if den else float(num)
+
+def _cloud(match, data):
+    cloud_type, height = match.groups()
+    height = int(height) * 100
+    data["cloud_layers"].append({
+        "type": cloud_type,
+        "height": height
+    })
+    if cloud_type in ("BKN", "OVC"):
+        if data["ceiling"] is None or height < data["ceiling"]:
+            data["ceiling"] = height
+
+def _altimeter(match, data):
+    data["altim_in_hg"] = int(match.group(1)) / 100
+
+def _temp_dew(match, data):
+    # Only the first temperature/dewpoint group counts; the dewpoint is set once it has been seen
+    if data["dewpoint_c"] is not None:
+        return
+    temp_minus, temp, dew_minus, dew = match.groups()
+    data["temp_c"] = -int(temp) if temp_minus else int(temp)
+    data["dewpoint_c"] = -int(dew) if dew_minus else int(dew)
+
+# Groups a token can be, looked up by its first character; at most one group matches any token
+_DIGIT_GROUPS = ((_OBS_TIME_RE, _obs_time), (_WIND_RE, _wind), (_VISIBILITY_RE, _visibility), (_TEMP_DEW_RE, _temp_dew))
+_CLOUD_GROUPS = ((_CLOUD_RE, _cloud),)
+_GROUP_DISPATCH = {
+    **dict.fromkeys("0123456789", _DIGIT_GROUPS),
+    **dict.fromkeys("SCFBO", _CLOUD_GROUPS),
+    "A": ((_ALTIMETER_RE, _altimeter),),
+    "M": ((_TEMP_DEW_RE, _temp_dew),),
+}
+
+def _loads(r):
+    # orjson parses the response bytes directly, skipping httpx's text decode and the stdlib json module
+    return orjson.loads(r.content)
+
+def _station_of(report: str) -> Optional[str]:
+    """Return the station identifier a raw METAR/TAF report is for."""
+    for token in report.split():
+        if token not in ("METAR", "SPECI", "TAF", "AMD", "COR"):
+            return token
+    return None
+
+def _parse_metar(metar_text: str) -> Dict[str, Any]:
+    """Parse one raw METAR report."""
+    if not metar_text:
+        return {"obs_time": None, "wind_dir": 0, "wind_speed": 0, "altim_in_hg": 29.92, "temp_c": 15, "raw": None, "debug": "No METAR data returned"}
+        
+    data = {
+        "obs_time": None, 
+        "wind_dir": 0, 
+        "wind_speed": 0, 
+        "wind_gust": 0, 
+        "altim_in_hg": 29.92, 
+        "temp_c": 15, 
+        "dewpoint_c": None,
+        "ceiling": None,
+        "cloud_layers": [],
+        "visibility": None,
+        "weather": set(),
+        "lightning": None,
+        "raw": metar_text, 
+        "debug": None
+    }
+    
+    parts = metar_text.split()
+    for i, part in enumerate(parts):
+        for pattern, handler in _GROUP_DISPATCH.get(part[:1], ()):
+            if match := pattern.fullmatch(part):
+                handler(match, data)
+                break
                 
-            if "KT" in part:
-                try:
-                    if "G" in part:
-                        gust_parts = part.split("G")
-                        base_part = gust_parts[0]
-                        data["wind_dir"] = int(base_part[:3])
-                        data["wind_speed"] = int(base_part[3:])
-                        data["wind_gust"] = int(gust_parts[1].replace("KT", ""))
-                    elif len(part) >= 7:
-                        data["wind_dir"] = int(part[:3])
-                        data["wind_speed"] = int(part[3:5])
-                except ValueError:
-                    pass
-                    
-            if not temp_c_found and "/" in part and part.count('/') == 1:
-                try:
-                    temp_str, dew_str = part.split('/')
-                    
-                    valid_temp_format = (temp_str.startswith('M') and len(temp_str) == 3 and temp_str[1:].isdigit()) or \
-                                        (not temp_str.startswith('M') and len(temp_str) == 2 and temp_str.isdigit())
-                    valid_dew_format = (dew_str.startswith('M') and len(dew_str) == 3 and dew_str[1:].isdigit()) or \
-                                       (not dew_str.startswith('M') and len(dew_str) == 2 and dew_str.isdigit())
-
-                    if valid_temp_format and valid_dew_format:
-                        if temp_str.startswith("M"):
-                            data["temp_c"] = -int(temp_str[1:])
-                        else:
-                            data["temp_c"] = int(temp_str)
-                        
-                        if dew_str.startswith("M"):
-                            data["dewpoint_c"] = -int(dew_str[1:])
-                        else:
-                            data["dewpoint_c"] = int(dew_str)
-                        temp_c_found = True
-                except (ValueError, IndexError):
-                    logger.warning(f"Failed to parse temperature from: {part}")
-                    pass
-                    
-            if "SM" in part:
-                try:
-                    vis = part.replace("SM", "")
-                    if "/" in vis:
-                        num, den = vis.split("/")
-                        data["visibility"] = float(num) / float(den)
-                    else:
-                        data["visibility"] = float(vis)
-                except ValueError:
-                    pass
-                    
-            if any(part.startswith(prefix) for prefix in ["SKC", "CLR", "FEW", "SCT", "BKN", "OVC"]):
-                try:
-                    cloud_type = part[:3]
-                    height = int(part[3:]) * 100
-                    
-                    data["cloud_layers"].append({
-                        "type": cloud_type,
-                        "height": height
-                    })
-                    
-                    if part.startswith(("BKN", "OVC")):
-                        if data["ceiling"] is None or height < data["ceiling"]:
-                            data["ceiling"] = height
-                except ValueError:
-                    pass
-                    
-            if "LTG" in part:
-                data["lightning"] = part
-                data["weather"].add(part)
-                if i + 2 < len(parts) and "DSNT" in parts[i:i+2] and "ALQDS" in parts[i:i+3]:
-                    data["weather"].add("LTG DSNT ALQDS")
-                    
-            if any(wx in part for wx in ["TS", "GR", "+", "FC", "SH", "FZ", "BR", "FG", "RA", "VCTS"]):
-                data["weather"].add(part)
+        if "LTG" in part:
+            data["lightning"] = part
+            data["weather"].add(part)
+            if i + 2 < len(parts) and "DSNT" in parts[i:i+2] and "ALQDS" in parts[i:i+3]:
+                data["weather"].add("LTG DSNT ALQDS")
                 
-            if part.startswith("TSE") and len(part) >= 7:
-                try:
-                    data["weather"].add(part)
-                except ValueError:
-                    pass
-                    
-            if part.startswith("A") and len(part) == 5:
-                try:
-                    data["altim_in_hg"] = float(part[1:]) / 100
-                except ValueError:
-                    pass
-        
-        data["weather"] = list(data["weather"])
-        return data
-    return await cached_fetch(f"metar_{icao}", url, parser)
+        # Thunderstorm end times (TSEhhmm) contain TS and are kept too
+        if _WEATHER_RE.search(part):
+            data["weather"].add(part)
+    
+    # Sorted so the same report always serializes, and is cached by weather_codes, the same way
+    # (set order varies with each worker's hash seed); a list, since callers extend it with +
+    data["weather"] = sorted(data["weather"])
+    return data
 
-async def fetch_taf(icao: str) -> Dict[str, Any]:
-    """Fetch and parse TAF data for an airport."""
-    url = f"{API_BASE}/taf?ids={icao}&format=json"
-    def parser(r):
+def _split_reports(text: str, icaos: List[str]) -> List[str]:
+    """
+    Split a multi-station raw response into one report per requested ICAO ("" if it has none).
+    Each report starts on an unindented line; indented lines (TAF change groups) continue it.
+    """
+    reports = {}
+    current = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if line[0].isspace():
+            if current is not None:
+                reports[current] += "\n" + line
+            continue
+        current = _station_of(line)
+        if current in reports:
+            # Only the latest report per station is used; older ones follow it
+            current = None
+        elif current is not None:
+            reports[current] = line
+    return [reports.get(icao.upper(), "") for icao in icaos]
+
+async def fetch_metars(icaos: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch and parse METAR data for several airports with one request."""
+    def url_for(missing):
+        return f"{API_BASE}/metar?ids={','.join(missing)}&format=raw"
+    def parser(r, missing):
+        logger.debug("[metar] Response headers: %s", r.headers)
+        logger.debug("[metar] Raw response: %.500s", r.text)
+        if len(missing) == 1:
+            return [_parse_metar(r.text.strip())]
+        return [_parse_metar(report) for report in _split_reports(r.text, missing)]
+    return await cached_fetch_batch("metar_", icaos, url_for, parser)
+
+async def fetch_metar(icao: str) -> Dict[str, Any]:
+    """Fetch and parse METAR data for an airport."""
+    return (await fetch_metars([icao]))[icao]
+
+def _parse_taf(taf: Any) -> Dict[str, Any]:
+    if isinstance(taf, dict):
+        if not taf:
+            return {"raw": "", "start_time": None, "end_time": None, "debug": "No TAF data returned"}
+        return {"raw": taf.get("raw_text"), "start_time": taf.get("start_time"), "end_time": taf.get("end_time"), "debug": None}
+    return {"raw": taf, "start_time": None, "end_time": None, "debug": "Text TAF fallback"}
+
+async def fetch_tafs(icaos: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch and parse TAF data for several airports with one request."""
+    def url_for(missing):
+        return f"{API_BASE}/taf?ids={','.join(missing)}&format=json"
+    def parser(r, missing):
         try:
-            taf_data = r.json()
+            taf_data = _loads(r)
         except Exception:
             taf_data = r.text
         if isinstance(taf_data, dict):
-            taf = taf_data.get("data", [{}])[0]
-            if not taf:
-                return {"raw": "", "start_time": None, "end_time": None, "debug": "No TAF data returned"}
-            return {"raw": taf.get("raw_text"), "start_time": taf.get("start_time"), "end_time": taf.get("end_time"), "debug": None}
-        else:
-            return {"raw": taf_data, "start_time": None, "end_time": None, "debug": "Text TAF fallback"}
-    return await cached_fetch(f"taf_{icao}", url, parser)
+            tafs = taf_data.get("data", [{}])
+            if len(missing) == 1:
+                return [_parse_taf(tafs[0])]
+            by_station = {}
+            for taf in tafs:
+                station = taf.get("station_id") or _station_of(taf.get("raw_text") or "")
+                by_station.setdefault(station, taf)
+            return [_parse_taf(by_station.get(icao.upper(), {})) for icao in missing]
+        if len(missing) == 1:
+            return [_parse_taf(taf_data)]
+        return [_parse_taf(report) for report in _split_reports(taf_data, missing)]
+    return await cached_fetch_batch("taf_", icaos, url_for, parser)
+
+async def fetch_taf(icao: str) -> Dict[str, Any]:
+    """Fetch and parse TAF data for an airport."""
+    return (await fetch_tafs([icao]))[icao]
 
 async def fetch_notams(icao: str) -> Dict[str, Any]:
     """Fetch and parse NOTAMs for an airport."""
@@ -189,7 +231,7 @@ async def fetch_mis(loc="dfw"):
     url = f"{API_BASE}/mis?loc={loc}&format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         return data if isinstance(data, dict) else {"raw": data}
@@ -200,7 +242,7 @@ async def fetch_fcstdisc(cwa="dfw"):
     url = f"{API_BASE}/fcstdisc?cwa={cwa}&format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         return data if isinstance(data, dict) else {"raw": data}
@@ -211,7 +253,7 @@ async def fetch_cwa(icao):
     url = f"{API_BASE}/cwa?format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         if isinstance(data, list):
@@ -223,7 +265,7 @@ async def fetch_windtemp(region="dfw"):
     url = f"{API_BASE}/windtemp?region={region}&format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         return data if isinstance(data, dict) else {"raw": data}
@@ -233,7 +275,7 @@ async def fetch_areafcst(region="aksouth"):
     url = f"{API_BASE}/areafcst?region={region}&format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         return data if isinstance(data, dict) else {"raw": data}
@@ -244,7 +286,7 @@ async def fetch_stationinfo(icao):
     url = f"{API_BASE}/stationinfo?ids={icao}"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
             if isinstance(data, dict):
                 info = data.get("data", [{}])[0]
                 return info
@@ -281,7 +323,7 @@ async def fetch_gairmet(icao):
     url = f"{API_BASE}/gairmet?format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         if isinstance(data, dict):
@@ -296,7 +338,7 @@ async def fetch_sigmet(icao):
     url = f"{API_BASE}/airsigmet?format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         if isinstance(data, dict):
@@ -311,7 +353,7 @@ async def fetch_pirep(icao):
     url = f"{API_BASE}/pirep?id={icao}&format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         return data.get("data", []) if isinstance(data, dict) else []
@@ -321,7 +363,7 @@ async def fetch_isigmet(icao):
     url = f"{API_BASE}/isigmet?format=json"
     def parser(r):
         try:
-            data = r.json()
+            data = _loads(r)
         except Exception:
             data = r.text
         if isinstance(data, dict):
@@ -3,34 +3,180 @@ Caching functions for RunwayGuard.
 Handles all caching of external API calls using Redis.
 """
 
-import httpx
 import asyncio
-import json
+import orjson
 import os
-from redis import asyncio as aioredis
-from dotenv import load_dotenv
+from functools import lru_cache, partial
 
-load_dotenv()
+# httpx, redis and dotenv are imported on first use so importing this module stays cheap;
+# the .env file is only read once per process even if several modules ask for it
+if not os.getenv('RG_DOTENV_LOADED'):
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ['RG_DOTENV_LOADED'] = '1'
 
 REDIS_URL = os.getenv('REDIS_URL')
 BUCKET_SECONDS = 60
 
-redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+@lru_cache(maxsize=1)
+def _redis():
+    from redis import asyncio as aioredis
+    # Values are kept as raw bytes; orjson parses them directly without a utf-8 decode step
+    return aioredis.from_url(REDIS_URL, decode_responses=False)
 
-async def cached_fetch(key, url, parser=None):
+@lru_cache(maxsize=1)
+def _get_client():
+    import httpx
+    # Shared client so connections, DNS lookups and TLS sessions are pooled across fetches; idle
+    # connections are kept for a minute (httpx defaults to 5s) so they outlive the gap between briefs
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+        http2=True
+    )
+
+# Stored values carry a one-byte header: plain JSON, or zstd-compressed JSON for larger payloads.
+# Values written before the header existed start with a JSON character and are read as plain.
+_PLAIN = b'\x00'
+_ZSTD = b'\x01'
+COMPRESS_MIN_BYTES = 1024
+
+@lru_cache(maxsize=1)
+def _zstd():
+    import zstandard
+    return zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+
+def _pack(payload):
+    if len(payload) > COMPRESS_MIN_BYTES:
+        return _ZSTD + _zstd()[0].compress(payload)
+    return _PLAIN + payload
+
+def _unpack(stored):
+    header = stored[:1]
+    if header == _ZSTD:
+        return _zstd()[1].decompress(stored[1:])
+    if header == _PLAIN:
+        return stored[1:]
+    return stored
+
+async def aclose():
+    """Close the shared HTTP client; called from the app shutdown hook."""
+    if _get_client.cache_info().currsize:
+        await _get_client().aclose()
+        _get_client.cache_clear()
+
+# Upstream fetches currently in progress, keyed by (cache key, raw), so concurrent misses share one request.
+# Each runs in its own task that every caller, including the one that started it, awaits through shield,
+# so a caller being cancelled (client disconnect, timeout) doesn't cancel the fetch for the others.
+_inflight = {}
+
+def _track(inflight_key, task):
+    _inflight[inflight_key] = task
+    task.add_done_callback(partial(_untrack, inflight_key))
+    return task
+
+def _untrack(inflight_key, task):
+    if _inflight.get(inflight_key) is task:
+        del _inflight[inflight_key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved so a failure nobody is still waiting on isn't logged
+
+def _start_fetch(key, url, parser, raw=False):
+    task = _inflight.get((key, raw))
+    if task is None:
+        task = _track((key, raw), asyncio.create_task(_fetch(key, url, parser, raw)))
+    return task
+
+async def _fetch_and_store(key, url, parser, raw=False):
+    return await asyncio.shield(_start_fetch(key, url, parser, raw))
+
+async def _fetch(key, url, parser, raw):
+    r = await _get_client().get(url)
+    r.raise_for_status()
+
+    if not parser and r.headers.get("content-type","").startswith("application/json"):
+        # Upstream JSON is cached verbatim and only decoded for callers that want objects
+        payload = r.content
+        data = payload if raw else orjson.loads(payload)
+    else:
+        data = parser(r) if parser else r.text
+        # Async parsers hand back an awaitable; checking the result avoids inspecting the parser's
+        # code flags on every call (fetchers define their parsers inline, so there is nothing to cache)
+        if hasattr(data, "__await__"):
+            data = await data
+        payload = orjson.dumps(data)
+        if raw:
+            data = payload
+
+    # NX keeps the first writer's value when several workers miss the same key at once
+    await _redis().set(key, _pack(payload), ex=BUCKET_SECONDS, nx=True)
+    return data
+
+def _start_batch_fetch(prefix, ids, url_for, parser):
+    """Start one upstream request for ids; returns a task per id, each also tracked in _inflight."""
+    keys = [f"{prefix}{id_}" for id_ in ids]
+    batch = asyncio.create_task(_fetch_batch(keys, url_for(ids), lambda r: parser(r, ids)))
+    return {
+        id_: _track((key, False), asyncio.create_task(_batch_item(batch, i)))
+        for i, (id_, key) in enumerate(zip(ids, keys))
+    }
+
+async def _fetch_batch(keys, url, parser):
+    r = await _get_client().get(url)
+    r.raise_for_status()
+    values = parser(r)
+
+    pipe = _redis().pipeline(transaction=False)
+    for key, value in zip(keys, values):
+        pipe.set(key, _pack(orjson.dumps(value)), ex=BUCKET_SECONDS, nx=True)
+    await pipe.execute()
+    return values
+
+async def _batch_item(batch, i):
+    return (await batch)[i]
+
+async def cached_fetch(key, url, parser=None, raw: bool = False):
+    """
+    Return the cached value for key, fetching url (and applying parser) on a miss.
+    With raw=True the JSON-encoded bytes are returned as stored, for handlers that pass them
+    straight through in a Response instead of decoding and re-encoding.
+    """
+    import httpx
     try:
-        cached_data = await redis.get(key)
+        cached_data = await _redis().get(key)
         if cached_data:
-            return json.loads(cached_data)
-            
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, timeout=10.0)
-            r.raise_for_status()
-            
-        data = await parser(r) if parser and asyncio.iscoroutinefunction(parser) else parser(r) if parser else r.json() if r.headers.get("content-type","").startswith("application/json") else r.text
-        
-        await redis.setex(key, BUCKET_SECONDS, json.dumps(data))
-        return data
-        
+            cached_data = _unpack(cached_data)
+            return cached_data if raw else orjson.loads(cached_data)
+
+        return await _fetch_and_store(key, url, parser, raw)
+
+    except httpx.RequestError as exc:
+        raise RuntimeError(f"Fetch failed: {exc}") from exc
+
+async def cached_fetch_batch(prefix, ids, url_for, parser):
+    """
+    Fetch several ids from an endpoint that answers them all in one request, caching each as prefix + id.
+    Cached ids are read in a single MGET round trip; the misses are fetched together from url_for(missing)
+    and parser(r, missing) returns one value per missing id, in order. Returns a dict keyed by id.
+    """
+    import httpx
+    ids = list(dict.fromkeys(ids))
+    keys = [f"{prefix}{id_}" for id_ in ids]
+    try:
+        cached_values = await _redis().mget(keys)
+
+        results = {id_: orjson.loads(_unpack(cached)) for id_, cached in zip(ids, cached_values) if cached}
+        # Misses another caller is already fetching (alone or in a batch) are awaited, not requested again
+        tasks = {id_: _inflight.get((f"{prefix}{id_}", False)) for id_ in ids if id_ not in results}
+        missing = [id_ for id_, task in tasks.items() if task is None]
+        if len(missing) == 1:
+            tasks[missing[0]] = _start_fetch(f"{prefix}{missing[0]}", url_for(missing),
+                                             lambda r: parser(r, missing)[0])
+        elif missing:
+            tasks.update(_start_batch_fetch(prefix, missing, url_for, parser))
+        for id_, task in tasks.items():
+            results[id_] = await asyncio.shield(task)
+        return results
+
     except httpx.RequestError as exc:
-        raise RuntimeError(f"Fetch failed: {exc}") from exc
\ No newline at end of file
+        raise RuntimeError(f"Fetch failed: {exc}") from exc
@@ -30,6 +30,8 @@ from routes.v1.printbrief import router as printbrief_router
 from routes.v1.info import router as info_router
 # from routes.v1.private.sms import router as sms_router -- soon
 from functions.infrastructure.database import initialize_database, db_manager
+from functions.infrastructure import caching
+from functions.core.probabilistic_rri import warm_up as warm_up_probabilistic
 
 # Lifespan for startup/shutdown events
 @asynccontextmanager
@@ -46,6 +48,12 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         logger.warning("API will continue without database functionality")
     
+    logger.info("Warming up probabilistic analysis...")
+    try:
+        warm_up_probabilistic()
+    except Exception as e:
+        logger.error(f"Probabilistic analysis warm-up failed: {str(e)}")
+    
     yield
     
     logger.info("Closing database connection...")
@@ -54,6 +62,12 @@ async def lifespan(app: FastAPI):
         logger.info("Database connection closed successfully")
     except Exception as e:
         logger.error(f"Error closing database connection: {str(e)}")
+    
+    logger.info("Closing HTTP client...")
+    try:
+        await caching.aclose()
+    except Exception as e:
+        logger.error(f"Error closing HTTP client: {str(e)}")
 
 # FastAPI app
 app = FastAPI(title="runwayguard", version="0.3.0", lifespan=lifespan)
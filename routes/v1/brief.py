@@ -30,7 +30,7 @@ from fastapi import APIRouter
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from functions.core.time_factors import calculate_time_risk_factor
-from functions.core.core_calculations import pressure_alt, density_alt, wind_components, gust_components, calculate_rri, calculate_advanced_rri, get_rri_category, get_status_from_rri
+from functions.core.core_calculations import pressure_alt, density_alt, wind_and_gust_components, calculate_rri, calculate_advanced_rri, get_rri_category, get_status_from_rri, weather_codes
 from functions.core.probabilistic_rri import calculate_probabilistic_rri_monte_carlo, calculate_advanced_probabilistic_rri
 from functions.data_sources.weather_fetcher import fetch_metar, fetch_taf, fetch_notams, fetch_stationinfo, fetch_gairmet, fetch_sigmet, fetch_isigmet, fetch_pirep, fetch_cwa, fetch_windtemp, fetch_areafcst, fetch_fcstdisc, fetch_mis
 from functions.data_sources.getairportinfo import fetch_airport_info
@@ -207,6 +207,12 @@ async def brief(request: Request, req: BriefRequest):
                 details={"icao": icao}
             )
             
+        # Station-level values are the same for every runway, so work them out once
+        da = density_alt(field_elev, temp_c, altim_in_hg)
+        lat = stationinfo.get("latitude")
+        lon = stationinfo.get("longitude")
+        now = datetime.utcnow()
+        
         runway_results = []
         for rwy in runways:
             rwy_id = rwy.get("id")
@@ -227,7 +233,7 @@ async def brief(request: Request, req: BriefRequest):
                     "gust_crosswind_kt": 0,
                     "tailwind": False,
                     "gust_tailwind": False,
-                    "density_altitude_ft": density_alt(field_elev, temp_c, altim_in_hg),
+                    "density_altitude_ft": da,
                     "runway_risk_index": 100,
                     "risk_category": "EXTREME",
                     "status": "NO-GO",
@@ -236,17 +242,11 @@ async def brief(request: Request, req: BriefRequest):
                 })
                 continue
                 
-            lat = stationinfo.get("latitude")
-            lon = stationinfo.get("longitude")
-            
             try:
-                da = density_alt(field_elev, temp_c, altim_in_hg)
                 da_diff = da - field_elev
-                head, cross, is_head = wind_components(rwy_heading, wind_dir, wind_speed)
-                
-                gust_head, gust_cross, gust_is_head = (0, 0, True)
-                if wind_gust > 0:
-                    gust_head, gust_cross, gust_is_head = gust_components(rwy_heading, wind_dir, wind_gust)
+                head, cross, is_head, gust_head, gust_cross, gust_is_head = wind_and_gust_components(
+                    rwy_heading, wind_dir, wind_speed, wind_gust
+                )
                 
                 runway_length = rwy.get("length")
                 
@@ -276,10 +276,11 @@ async def brief(request: Request, req: BriefRequest):
                     terrain_factor=terrain_factor,
                     historical_trend=None,
                     aircraft_category=req.aircraft_type,
-                    config=config
+                    config=config,
+                    now=now
                 )
                 
-                time_factors = calculate_time_risk_factor(datetime.utcnow(), lat, lon, rwy_heading) if lat and lon else None
+                time_factors = calculate_time_risk_factor(now, lat, lon, rwy_heading) if lat and lon else None
                 
                 weather = metar.get("weather", [])
                 ceiling = metar.get("ceiling")
@@ -313,7 +314,8 @@ async def brief(request: Request, req: BriefRequest):
                             include_extremes=True,
                             runway_length=runway_length,
                             airport_elevation=field_elev,
-                            aircraft_category=req.aircraft_type
+                            aircraft_category=req.aircraft_type,
+                            now=now
                         )
                         
                         probabilistic_analysis = {
@@ -325,11 +327,11 @@ async def brief(request: Request, req: BriefRequest):
                             "extreme_scenarios": probabilistic_result.extreme_scenarios[:5],
                             "temporal_forecast": probabilistic_result.temporal_evolution,
                             "scenario_summary": {
-                                "total_scenarios": len(probabilistic_result.scenario_clusters["normal"]) + 
-                                                 len(probabilistic_result.scenario_clusters["deteriorating"]) + 
-                                                 len(probabilistic_result.scenario_clusters["improving"]),
-                                "deteriorating_scenarios": len(probabilistic_result.scenario_clusters["deteriorating"]),
-                                "improving_scenarios": len(probabilistic_result.scenario_clusters["improving"])
+                                "total_scenarios": len(probabilistic_result.scenario_clusters["normal"]["rri"]) + 
+                                                 len(probabilistic_result.scenario_clusters["deteriorating"]["rri"]) + 
+                                                 len(probabilistic_result.scenario_clusters["improving"]["rri"]),
+                                "deteriorating_scenarios": len(probabilistic_result.scenario_clusters["deteriorating"]["rri"]),
+                                "improving_scenarios": len(probabilistic_result.scenario_clusters["improving"]["rri"])
                             }
                         }
                         
@@ -375,9 +377,10 @@ async def brief(request: Request, req: BriefRequest):
                 if contributor in rri_contributors and isinstance(rri_contributors[contributor]["value"], list):
                     warnings.extend(rri_contributors[contributor]["value"])
             
-            if any("TS" in weather_condition for weather_condition in weather):
+            wx = weather_codes(weather)
+            if "TS" in wx:
                 warnings.append("Active thunderstorm in vicinity - NO-GO condition.")
-            if any("LTG" in weather_condition for weather_condition in weather):
+            if "LTG" in wx:
                 if any(all(condition in weather_condition for condition in ["DSNT", "ALQDS"]) for weather_condition in weather):
                     warnings.append("Lightning observed in all quadrants.")
                 else:
@@ -386,13 +389,13 @@ async def brief(request: Request, req: BriefRequest):
                 warnings.append(f"Low ceiling: {ceiling} ft AGL.")
             if visibility is not None and visibility < 5:
                 warnings.append(f"Reduced visibility: {visibility} SM.")
-            if any("GR" in weather_condition for weather_condition in weather):
+            if "GR" in wx:
                 warnings.append("Hail reported.")
-            if any("FC" in weather_condition for weather_condition in weather):
+            if "FC" in wx:
                 warnings.append("Funnel cloud reported - NO-GO condition.")
-            if any("FZ" in weather_condition for weather_condition in weather):
+            if "FZ" in wx:
                 warnings.append("Freezing precipitation reported.")
-            if any("+" in weather_condition for weather_condition in weather):
+            if "+" in wx:
                 warnings.append("Heavy precipitation reported.")
                     
             if da_diff > 2000:
@@ -428,7 +431,7 @@ async def brief(request: Request, req: BriefRequest):
                     "terrain_effects": terrain_factor > 1.0
                 },
                 "configuration_impact": {
-                    "risk_profile": config.risk_profile.value,
+                    "risk_profile": config.risk_profile.label,
                     "threshold_adjustment": f"{config.threshold_multiplier:.1f}x normal thresholds",
                     "runway_requirement": f"{config.runway_length_requirement}ft minimum recommended"
                 },
@@ -591,8 +594,8 @@ async def brief(request: Request, req: BriefRequest):
             "aircraft_config": {
                 "type": req.aircraft_type,
                 "experience_level": req.pilot_experience,
-                "category": config.aircraft_category.value,
-                "risk_profile": config.risk_profile.value,
+                "category": config.aircraft_category.label,
+                "risk_profile": config.risk_profile.label,
                 "runway_requirement_ft": config.runway_length_requirement,
                 "threshold_multiplier": config.threshold_multiplier
             },